@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from pulp import PULP_CBC_CMD
+
+from formulations import build_model
+from generate import random_instance
+from heuristic import list_schedule
+from instance import format_mix, parse_mix
+from metrics import parse_cbc_log
+from scheduler import default_instance, solve_schedule
+from solvers import HighsSolver
+
+
+def build_memory(instance, counts, max_duration, options):
+    # Peak Python memory of building the model, measured in a separate build so the timings are not slowed down
+    if options.get("formulation") == "heft":
+        return 0
+    processors, time_costs_per_processor = instance.processors(counts)
+    model_options = {key: value for key, value in options.items() if key != "warm_start"}
+    tracemalloc.start()
+    build_model(model_options.pop("formulation", "disjunctive"), instance.tasks, instance.predecessors,
+                processors, time_costs_per_processor, max_duration, **model_options)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def scale_time_step(instance, counts, max_duration, options):
+    # time_step "scaled" is a quarter of the shortest execution time (49 on the assignment instance),
+    # so the rounding does not depend on the scale of the costs. The rounded durations can make the
+    # horizon too short, it is extended to the list schedule with the rounded durations.
+    if options.get("time_step") != "scaled":
+        return max_duration, options
+    time_step = max(1, min(min(costs) for costs in instance.time_costs) // 4)
+    processors, time_costs_per_processor = instance.processors(counts)
+    rounded = [[-(-cost // time_step) * time_step for cost in costs] for costs in time_costs_per_processor]
+    rounded_makespan = list_schedule(instance.tasks, instance.predecessors, processors, rounded)["makespan"]
+    return max(max_duration, rounded_makespan), dict(options, time_step=time_step)
+
+
+def row_status(result):
+    # "Optimal" only for a proven optimum of an exact model, a solve stopped at a limit with a
+    # schedule is "Feasible" although the solver reports "Optimal"
+    if result.get("proven"):
+        return "Optimal" if result["exact"] else "Approximate"
+    if result["status"] == "Optimal" and result["makespan"] is not None:
+        return "Feasible"
+    return result["status"]
+
+
+def run_case(case, options, time_limit, solver_name="cbc"):
+    instance, counts, max_duration = case["instance"], case["counts"], case["max_duration"]
+    max_duration, options = scale_time_step(instance, counts, max_duration, options)
+    processors, time_costs_per_processor = instance.processors(counts)
+    log_path = None
+    if options.get("formulation") == "heft":
+        solver = None
+    elif solver_name == "highs":
+        # Node count and gap are read from the solver itself
+        solver = HighsSolver(timeLimit=time_limit)
+    else:
+        log_file, log_path = tempfile.mkstemp(suffix=".log")
+        os.close(log_file)
+        solver = PULP_CBC_CMD(msg=False, timeLimit=time_limit, logPath=log_path)
+    start = time.perf_counter()
+    result = solve_schedule(processors, time_costs_per_processor, max_duration, solver=solver, instance=instance, **options)
+    total_time = time.perf_counter() - start
+
+    stats = dict(getattr(solver, "stats", {}))
+    if log_path is not None:
+        if os.path.exists(log_path):
+            stats = parse_cbc_log(log_path)
+            os.remove(log_path)
+    build_time = result.get("build_time") or 0
+    return {
+        "makespan": result["makespan"],
+        "status": row_status(result),
+        "build_time": build_time,
+        "solve_time": total_time - build_time,
+        "nodes": stats.get("nodes"),
+        "gap": stats.get("gap"),
+        "peak_memory": build_memory(instance, counts, max_duration, options),
+    }
+
+
+def run_benchmark(cases, variants, time_limit=120, solver_name="cbc"):
+    # Solve every case with every variant of model options
+    rows = []
+    for case in cases:
+        for name, options in variants.items():
+            row = {"case": case["name"], "variant": name, "solver": solver_name}
+            row.update(run_case(case, options, time_limit, solver_name))
+            rows.append(row)
+    return rows
+
+
+def make_case(instance, counts, max_duration=None):
+    # Without a bound the makespan of the list schedule is used, it is always feasible
+    if max_duration is None:
+        processors, time_costs_per_processor = instance.processors(counts)
+        max_duration = list_schedule(instance.tasks, instance.predecessors, processors, time_costs_per_processor)["makespan"]
+    return {"name": "%s/%s" % (instance.name, format_mix(counts)), "instance": instance, "counts": counts, "max_duration": max_duration}
+
+
+def default_cases():
+    return [make_case(default_instance, {"A": n_a, "B": n_b}, max_duration)
+            for n_a, n_b, max_duration in [(1, 1, 6203), (2, 2, 6203), (4, 0, 6456), (4, 4, 6203), (4, 4, 2455)]]
+
+
+def generated_cases(sizes, shapes, mixes, distribution="uniform", seed=0):
+    return [make_case(random_instance(n_tasks, shape, processor_types=list(counts), seed=seed, distribution=distribution), counts)
+            for shape in shapes for n_tasks in sizes for counts in mixes]
+
+
+def print_rows(rows):
+    print("%-36s %-14s %-10s %-11s %-10s %-10s %-7s %-7s %s" % (
+        "case", "variant", "makespan", "status", "build (s)", "solve (s)", "nodes", "gap", "memory (MB)"))
+    for row in rows:
+        print("%-36s %-14s %-10s %-11s %-10.3f %-10.2f %-7s %-7s %.1f" % (
+            row["case"], row["variant"], row["makespan"], row["status"], row["build_time"], row["solve_time"],
+            "-" if row["nodes"] is None else row["nodes"],
+            "-" if row["gap"] is None else "%.3f" % row["gap"],
+            row["peak_memory"] / 1e6))
+
+
+def compare_rows(rows, baseline, tolerance=1.5, min_time=0.05):
+    # Regressions against the baseline rows: a build or solve that takes more than tolerance times
+    # as long (ignoring times below min_time) or a worse makespan
+    previous = {(row["case"], row["variant"]): row for row in baseline}
+    regressions = []
+    for row in rows:
+        old = previous.get((row["case"], row["variant"]))
+        if old is None:
+            continue
+        for field in ["build_time", "solve_time"]:
+            if row[field] > min_time and row[field] > tolerance * old[field]:
+                regressions.append("%s %s: %s %.3f -> %.3f" % (row["case"], row["variant"], field, old[field], row[field]))
+        if old["makespan"] is not None and (row["makespan"] is None or row["makespan"] > old["makespan"]):
+            regressions.append("%s %s: makespan %s -> %s" % (row["case"], row["variant"], old["makespan"], row["makespan"]))
+    return regressions
+
+
+VARIANTS = {
+    "global big-M": {"big_m": "global"},
+    "tight big-M": {"big_m": "tight"},
+    "warm start": {"warm_start": True},
+    "warm start+SB": {"warm_start": True, "symmetry_breaking": "index"},
+    "heft": {"formulation": "heft"},
+    "sequence": {"formulation": "sequence"},
+    # Durations rounded up to a quarter of the shortest task, an upper bound on the optimum
+    "time-indexed": {"formulation": "time-indexed", "time_step": "scaled"},
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling formulations")
+    parser.add_argument("--time-limit", type=int, default=120)
+    parser.add_argument("--solver", default="cbc", choices=["cbc", "highs"])
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--generated", action="store_true", help="random DAGs instead of the assignment instance")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--shapes", nargs="+", default=["layered", "series-parallel"], choices=["layered", "series-parallel"])
+    parser.add_argument("--mixes", nargs="+", default=["2A2B", "4A2B"], help="processors per type, e.g. 2A1B")
+    parser.add_argument("--distribution", default="uniform", choices=["uniform", "lognormal"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="JSON file with earlier rows to compare against")
+    parser.add_argument("--save-baseline", help="write the rows to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    if args.generated:
+        cases = generated_cases(args.sizes, args.shapes, [parse_mix(mix) for mix in args.mixes], args.distribution, args.seed)
+    else:
+        cases = default_cases()
+    rows = run_benchmark(cases, {name: VARIANTS[name] for name in args.variants}, args.time_limit, args.solver)
+    print_rows(rows)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(rows, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_rows(rows, json.load(f), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            raise SystemExit(1)
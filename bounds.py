@@ -0,0 +1,55 @@
+import math
+
+import numpy as np
+from pulp import PULP_CBC_CMD, LpStatusOptimal, value
+
+from dag import DagIndex
+from decomposition import AssignmentMaster
+
+# Lower bounds on the makespan of an instance on counts[type] processors of every type. Every task
+# runs at least as long as on the fastest type that has a processor, which gives the critical path
+# and the load bounds without solving anything. The LP bound splits every task over the types and
+# combines the precedences with the work per type, it is at least as strong as both.
+
+
+def available_types(instance, counts):
+    return [t for t, processor_type in enumerate(instance.processor_types) if counts.get(processor_type, 0) > 0]
+
+
+def fastest_costs(instance, counts):
+    return [min(instance.time_costs[t][j] for t in available_types(instance, counts)) for j in range(len(instance.tasks))]
+
+
+def critical_path_bound(instance, counts, dag=None):
+    # The longest path through the DAG
+    dag = dag or DagIndex(instance.predecessors)
+    return max(dag.tails(fastest_costs(instance, counts)), default=0)
+
+
+def load_bound(instance, counts):
+    # The total work spread evenly over all processors
+    return math.ceil(sum(fastest_costs(instance, counts)) / sum(counts.values()))
+
+
+def lp_bound(instance, counts, solver=None):
+    # Optimum of the LP relaxation of the assignment master of the decomposition, rounded up as
+    # the execution times are integers
+    types = available_types(instance, counts)
+    type_costs = np.array([instance.time_costs[t] for t in types], dtype=np.int64)
+    type_counts = np.array([counts[instance.processor_types[t]] for t in types], dtype=np.int64)
+    # Running the tasks one after the other is always possible, so that is a valid horizon
+    master = AssignmentMaster(instance.predecessors, type_costs, type_counts, int(type_costs.min(axis=0).sum()), relaxed=True)
+    master.prob.solve(solver or PULP_CBC_CMD(msg=False))
+    if master.prob.status != LpStatusOptimal:
+        return 0
+    return math.ceil(value(master.makespan) - 1e-6)
+
+
+def makespan_lower_bound(instance, counts, dag=None, lp=False):
+    # The best of the bounds, math.inf without processors. lp also solves the LP relaxation.
+    if not available_types(instance, counts):
+        return math.inf
+    bound = max(critical_path_bound(instance, counts, dag), load_bound(instance, counts))
+    if lp:
+        bound = max(bound, lp_bound(instance, counts))
+    return bound
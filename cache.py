@@ -0,0 +1,99 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solve_cache (
+    fingerprint TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    last_used REAL
+);
+"""
+
+
+def processor_groups(processors, time_costs_per_processor):
+    # Processors with the same time costs are interchangeable, whatever their name or type
+    groups = {}
+    for processor, costs in zip(processors, time_costs_per_processor):
+        groups.setdefault(tuple(costs), []).append(processor)
+    return sorted(groups.items())
+
+
+def fingerprint(processors, time_costs_per_processor, predecesssors):
+    groups = processor_groups(processors, time_costs_per_processor)
+    canonical = {
+        "processors": [[list(costs), len(members)] for costs, members in groups],
+        "predecessors": list(predecesssors),
+    }
+    return hashlib.sha256(json.dumps(canonical, separators=(",", ":")).encode()).hexdigest()
+
+
+class SolveCache:
+    def __init__(self, path=None, maxsize=128, max_disk_entries=10000):
+        # Least recently used results are kept in memory, all of them on disk if a path is given
+        self.memory = OrderedDict()
+        self.maxsize = maxsize
+        self.max_disk_entries = max_disk_entries
+        self.connection = None
+        if path is not None:
+            self.connection = sqlite3.connect(path, timeout=60)
+            self.connection.executescript(SCHEMA)
+
+    def get(self, processors, time_costs_per_processor, predecesssors):
+        key = fingerprint(processors, time_costs_per_processor, predecesssors)
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+        elif self.connection is not None:
+            row = self.connection.execute("SELECT result FROM solve_cache WHERE fingerprint = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            entry = json.loads(row[0])
+            with self.connection:
+                self.connection.execute("UPDATE solve_cache SET last_used = ? WHERE fingerprint = ?", (time.time(), key))
+            self.remember(key, entry)
+        else:
+            return None
+        return self.decode(entry, processors, time_costs_per_processor)
+
+    def put(self, processors, time_costs_per_processor, predecesssors, result):
+        key = fingerprint(processors, time_costs_per_processor, predecesssors)
+        entry = self.encode(result, processors, time_costs_per_processor)
+        self.remember(key, entry)
+        if self.connection is None:
+            return
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO solve_cache (fingerprint, result, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(entry), time.time()),
+            )
+            self.connection.execute(
+                "DELETE FROM solve_cache WHERE fingerprint NOT IN "
+                "(SELECT fingerprint FROM solve_cache ORDER BY last_used DESC LIMIT ?)",
+                (self.max_disk_entries,),
+            )
+
+    def remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def encode(self, result, processors, time_costs_per_processor):
+        # Store the assignment as (group, unit) so it can be mapped onto any equivalent processor set
+        units = {}
+        for g, (_, members) in enumerate(processor_groups(processors, time_costs_per_processor)):
+            for u, processor in enumerate(members):
+                units[processor] = [g, u]
+        # The Schedule is rebuilt from the start times and the assignment when the entry is used
+        entry = {key: value for key, value in result.items() if key != "schedule"}
+        entry["assignment"] = {task: units[processor] for task, processor in result["assignment"].items()}
+        return entry
+
+    def decode(self, entry, processors, time_costs_per_processor):
+        groups = processor_groups(processors, time_costs_per_processor)
+        result = dict(entry)
+        result["assignment"] = {task: groups[g][1][u] for task, (g, u) in entry["assignment"].items()}
+        return result
@@ -0,0 +1,153 @@
+import argparse
+import json
+import sys
+
+# Headless command line: python cli.py solve|sweep|pareto ...
+# Only argparse and json are imported at startup. Every command imports what it needs: the
+# heuristics need neither PuLP nor a solver backend, and matplotlib is only imported to write a plot.
+# Nothing opens a window, plots are written to the file given with --plot.
+
+FORMULATIONS = ["disjunctive", "cost", "time-indexed", "sequence", "heft", "tabu", "benders"]
+
+
+def parse_costs(text):
+    # "A=62,B=89" -> {"A": 62, "B": 89}
+    return {processor_type: int(cost) for processor_type, cost in (item.split("=") for item in text.split(","))}
+
+
+def load(path):
+    if path is None:
+        from scheduler import default_instance
+        return default_instance
+    from instance import load_instance
+    return load_instance(path)
+
+
+def print_result(result, as_json):
+    if as_json:
+        print(json.dumps({key: value for key, value in result.items() if key != "schedule"}))
+        return
+    print("%s %s: makespan %s (%s, %.3f s)" % (result.get("instance"), result["formulation"], result["makespan"], result["status"], result["wall_time"]))
+    if result.get("cost") is not None:
+        print("processors %s, cost %s" % (", ".join(result["used"]), result["cost"]))
+    for task, processor in sorted(result["assignment"].items(), key=lambda item: result["start_times"][item[0]]):
+        print("  %-6s %-4s %d" % (task, processor, result["start_times"][task]))
+
+
+def solve(args):
+    from instance import parse_mix
+    from scheduler import solve_instance
+
+    instance = load(args.instance)
+    counts = parse_mix(args.counts)
+    max_duration = args.max_duration or instance.serial_makespan()
+    options = {}
+    if args.formulation not in ("heft", "tabu"):
+        from solvers import make_solver
+        options["solver"] = make_solver(args.solver, time_limit=args.time_limit, gap=args.gap)
+        options["warm_start"] = args.warm_start
+    if args.formulation == "cost":
+        # counts is the pool the model picks its processors from
+        options.update(costs=parse_costs(args.costs), objective=args.objective, weight=args.weight)
+    result = solve_instance(instance, counts, max_duration, formulation=args.formulation, time_limit=args.time_limit, gap=args.gap, **options)
+    print_result(result, args.json)
+    if args.plot and result["makespan"] is not None:
+        from plotting import plot_schedule
+        plot_schedule(result["schedule"], args.plot)
+    return 0 if result["makespan"] is not None else 1
+
+
+def sweep(args):
+    from solvers import make_solver
+    from sweep import run_sweep
+
+    makespans, system_costs = run_sweep(args.max_a, args.max_b, args.max_duration, parse_costs(args.costs), args.processes,
+                                        args.store, args.experiment, plot=args.gantt, cache_path=args.cache, incremental=args.incremental,
+                                        solver=make_solver("cbc"))
+    print(json.dumps({"makespans": makespans, "system_costs": system_costs}))
+    if args.plot:
+        from pareto import non_dominated
+        from plotting import plot_front
+        plot_front(system_costs, makespans, non_dominated(list(zip(system_costs, makespans))), args.plot)
+    return 0
+
+
+def pareto(args):
+    from cache import SolveCache
+    from instance import parse_mix
+    from pareto import pareto_front
+    from result_store import ResultStore
+    from solvers import make_solver
+
+    store = None if args.store is None else ResultStore(args.store)
+    cache = None if args.cache is None else SolveCache(args.cache)
+    if args.single_model:
+        from pareto import cost_front
+        front, solved = cost_front(parse_mix(args.max_counts), args.max_duration, parse_costs(args.costs), load(args.instance), solver=make_solver(args.solver))
+    else:
+        front, solved = pareto_front(parse_mix(args.max_counts), args.max_duration, parse_costs(args.costs), load(args.instance),
+                                     store=store, experiment=args.experiment, cache=cache, solver=make_solver(args.solver))
+    print(json.dumps({"front": [{"counts": result["counts"], "cost": result["cost"], "makespan": result["makespan"]} for result in front], "solved": solved}))
+    if args.plot:
+        from plotting import plot_front
+        points = [(result["cost"], result["makespan"]) for result in front]
+        plot_front([point[0] for point in points], [point[1] for point in points], points, args.plot)
+    return 0
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog="schedule", description="Schedule a task DAG on A and B processors")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("solve", help="schedule one processor configuration")
+    command.add_argument("--instance", help=".jsonl, .json or .csv instance, the assignment instance without it")
+    command.add_argument("--counts", default="1A1B", help="processors per type, e.g. 2A1B")
+    command.add_argument("--max-duration", type=int, help="largest makespan of interest")
+    command.add_argument("--formulation", default="disjunctive", choices=FORMULATIONS)
+    command.add_argument("--solver", default="cbc", choices=["cbc", "highs"])
+    command.add_argument("--time-limit", type=float)
+    command.add_argument("--gap", type=float)
+    command.add_argument("--no-warm-start", dest="warm_start", action="store_false")
+    command.add_argument("--costs", default="A=62,B=89", help="cost per processor type, for the cost formulation")
+    command.add_argument("--objective", default="cost", choices=["cost", "makespan", "weighted"], help="what the cost formulation minimizes first")
+    command.add_argument("--weight", type=float, default=1, help="cost weight of the weighted objective")
+    command.add_argument("--json", action="store_true", help="print the result as one JSON object")
+    command.add_argument("--plot", help="write the Gantt chart to this file")
+    command.set_defaults(run=solve)
+
+    command = commands.add_parser("sweep", help="solve every configuration of up to max-a A and max-b B processors")
+    command.add_argument("--max-a", type=int, default=4)
+    command.add_argument("--max-b", type=int, default=4)
+    command.add_argument("--max-duration", type=int, default=6201)
+    command.add_argument("--costs", default="A=62,B=89", help="cost per processor type")
+    command.add_argument("--processes", type=int)
+    command.add_argument("--store", help="result store database")
+    command.add_argument("--cache", help="solve cache database")
+    command.add_argument("--experiment")
+    command.add_argument("--incremental", action="store_true")
+    command.add_argument("--gantt", action="store_true", help="write the Gantt chart of every configuration")
+    command.add_argument("--plot", help="write the cost/makespan plot to this file")
+    command.set_defaults(run=sweep)
+
+    command = commands.add_parser("pareto", help="only the configurations on the cost/makespan front")
+    command.add_argument("--instance", help=".jsonl, .json or .csv instance, the assignment instance without it")
+    command.add_argument("--max-counts", default="4A4B")
+    command.add_argument("--solver", default="cbc", choices=["cbc", "highs"])
+    command.add_argument("--max-duration", type=int, default=6201)
+    command.add_argument("--costs", default="A=62,B=89", help="cost per processor type")
+    command.add_argument("--store", help="result store database")
+    command.add_argument("--cache", help="solve cache database")
+    command.add_argument("--experiment")
+    command.add_argument("--single-model", action="store_true", help="one cost model over the pool instead of a solve per configuration")
+    command.add_argument("--plot", help="write the front to this file")
+    command.set_defaults(run=pareto)
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+def topological_order(predecessors):
+    n_tasks = len(predecessors)
+    successors = [[] for j in range(n_tasks)]
+    waiting = [len(predecessors[i]) for i in range(n_tasks)]
+    for i in range(n_tasks):
+        for j in predecessors[i]:
+            successors[j].append(i)
+    order = [j for j in range(n_tasks) if waiting[j] == 0]
+    for j in order:
+        for s in successors[j]:
+            waiting[s] -= 1
+            if waiting[s] == 0:
+                order.append(s)
+    if len(order) != n_tasks:
+        raise ValueError("The precedence graph has a cycle")
+    return order, successors
+
+
+class DagIndex:
+    # Precedence structure of the tasks: topological order and the transitive closure as bitsets,
+    # bit i of ancestors[j] is set if task i has to finish before task j can start
+    def __init__(self, predecessors):
+        self.predecessors = predecessors
+        self.order, self.successors = topological_order(predecessors)
+        self.ancestors = [0] * len(predecessors)
+        self.descendants = [0] * len(predecessors)
+        for j in self.order:
+            for i in predecessors[j]:
+                self.ancestors[j] |= self.ancestors[i] | (1 << i)
+        for j in reversed(self.order):
+            for s in self.successors[j]:
+                self.descendants[j] |= self.descendants[s] | (1 << s)
+
+    def precedes(self, i, j):
+        return (self.ancestors[j] >> i) & 1 == 1
+
+    def comparable(self, i, j):
+        # One of the two tasks has to wait for the other, so they can never overlap
+        return self.precedes(i, j) or self.precedes(j, i)
+
+    def earliest_starts(self, durations):
+        # Longest path from the start of the DAG to each task
+        start = [0] * len(self.predecessors)
+        for j in self.order:
+            start[j] = max([start[i] + durations[i] for i in self.predecessors[j]], default=0)
+        return start
+
+    def tails(self, durations):
+        # Longest path from the start of each task to the end of the DAG, including the task itself
+        tail = [0] * len(self.predecessors)
+        for j in reversed(self.order):
+            tail[j] = durations[j] + max([tail[s] for s in self.successors[j]], default=0)
+        return tail
+
+    def latest_starts(self, durations, horizon):
+        return [horizon - tail for tail in self.tails(durations)]
@@ -0,0 +1,174 @@
+import math
+import time
+
+import numpy as np
+from pulp import (PULP_CBC_CMD, LpAffineExpression, LpBinary, LpConstraint, LpConstraintEQ, LpConstraintGE, LpContinuous, LpInteger,
+                  LpMinimize, LpProblem, LpSolutionOptimal, LpStatusInfeasible, LpVariable, value)
+
+from dag import DagIndex
+from formulations import build_model
+from heuristic import list_schedule
+from metrics import solve_with_metrics
+
+# Logic-based Benders decomposition of the schedule. Processors with the same time costs form a
+# type. The master problem only decides the type of every task, with the longest path and the work
+# per type as a relaxation of the makespan, so it has no big-M pairs at all. For the types it picks,
+# the subproblem sequences the tasks with the disjunctive model restricted to those types: a task
+# only needs a disjunction with the tasks of its own type. The subproblem returns a schedule and a
+# bound on the makespan of the assignment, which goes back to the master as a cut. The master
+# optimum is a lower bound on the makespan, so the loop stops once it reaches the best schedule.
+
+
+class AssignmentMaster:
+    # type_costs[g][j] is the execution time of task j on type g, type_counts[g] the number of processors of type g.
+    # relaxed drops the integrality, the optimum of that LP is a lower bound on the makespan.
+    def __init__(self, predecessors, type_costs, type_counts, max_duration, relaxed=False):
+        n_types, n_tasks = type_costs.shape
+        self.type_costs = type_costs
+        self.prob = LpProblem("assignment_master", LpMinimize)
+        dag = DagIndex(predecessors)
+        min_costs = type_costs.min(axis=0).tolist()
+        earliest_start = dag.earliest_starts(min_costs)
+        latest_start = dag.latest_starts(min_costs, max_duration)
+        # Longest path and the work on the fastest types spread over all processors
+        lower_bound = max(max(dag.tails(min_costs), default=0), math.ceil(sum(min_costs) / type_counts.sum()))
+
+        self.assigned = [[LpVariable("z_%d_%d" % (g, j), 0, 1, LpContinuous if relaxed else LpBinary) for j in range(n_tasks)] for g in range(n_types)]
+        self.starting_times = [LpVariable("S_%d" % j, earliest_start[j], max(earliest_start[j], latest_start[j])) for j in range(n_tasks)]
+        self.makespan = LpVariable("makespan", lower_bound, max_duration, LpContinuous if relaxed else LpInteger)
+        self.prob += self.makespan
+
+        duration = [[(self.assigned[g][j], int(type_costs[g, j])) for g in range(n_types)] for j in range(n_tasks)]
+        for j in range(n_tasks):
+            # Every task gets one type
+            self.prob += LpConstraint(LpAffineExpression([(self.assigned[g][j], 1) for g in range(n_types)]), LpConstraintEQ, rhs=1)
+            # A task starts after its predecessors have finished
+            for i in predecessors[j]:
+                self.prob += LpConstraint(LpAffineExpression([(self.starting_times[j], 1), (self.starting_times[i], -1)] + [(var, -cost) for var, cost in duration[i]]), LpConstraintGE, rhs=0)
+            # Tasks without successors end before the makespan
+            if not dag.successors[j]:
+                self.prob += LpConstraint(LpAffineExpression([(self.makespan, 1), (self.starting_times[j], -1)] + [(var, -cost) for var, cost in duration[j]]), LpConstraintGE, rhs=0)
+        # The processors of a type together do all its work within the makespan
+        for g in range(n_types):
+            self.prob += LpConstraint(LpAffineExpression([(self.makespan, int(type_counts[g]))] + [(self.assigned[g][j], -int(type_costs[g, j])) for j in range(n_tasks)]), LpConstraintGE, rhs=0)
+
+    def add_cut(self, types, bound):
+        # The assignment types has no schedule below bound. Moving task j to another type shortens
+        # the schedule by at most its execution time plus the longest task of its type: the task
+        # can be put back by delaying everything from its start by that much.
+        longest = self.type_costs.max(axis=1)
+        delta = np.minimum(bound, self.type_costs[types, np.arange(len(types))] + longest[types])
+        terms = [(self.makespan, 1)] + [(self.assigned[g][j], -int(delta[j])) for j, g in enumerate(types)]
+        self.prob += LpConstraint(LpAffineExpression(terms), LpConstraintGE, rhs=int(bound - delta.sum()))
+
+    def solve(self, solver):
+        # The type of every task and the optimal makespan of the relaxation, None if it is not proven
+        # optimal or there is no assignment below the makespan bound
+        self.prob.solve(solver)
+        if self.prob.sol_status != LpSolutionOptimal:
+            return None, self.prob.status == LpStatusInfeasible
+        types = np.array([[var.varValue or 0 for var in row] for row in self.assigned]).argmax(axis=0)
+        return (types, int(round(value(self.makespan)))), False
+
+
+def solve_decomposition(tasks, predecessors, processors, time_costs_per_processor, max_duration, solver=None, time_limit=None, gap=None, max_iterations=None, subproblem_time_limit=None, metrics=None, **options):
+    # options go to the disjunctive model of the subproblems. Stops at the time limit, after
+    # max_iterations subproblems or when the relative gap between the best schedule and the bound is at most gap.
+    # subproblem_time_limit stops every subproblem early, its bound still gives a cut.
+    solve_start = time.perf_counter()
+    deadline = None if time_limit is None else solve_start + time_limit
+    solver = solver or PULP_CBC_CMD(msg=False)
+    # A gap of the solver only applies to the subproblems. The master is solved to optimality, its
+    # optimum is the lower bound, within what is left of the time limit.
+    solver_time_limit = solver.timeLimit
+    subproblem_gap = solver.optionsDict.get("gapRel")
+    costs = np.asarray(time_costs_per_processor, dtype=np.int64)
+    type_index = {}
+    processor_type = np.array([type_index.setdefault(tuple(row), len(type_index)) for row in costs.tolist()])
+    type_costs = np.array([list(row) for row in type_index], dtype=np.int64)
+    master = AssignmentMaster(predecessors, type_costs, np.bincount(processor_type), max_duration)
+    build_time = time.perf_counter() - solve_start
+
+    best = list_schedule(tasks, predecessors, processors, time_costs_per_processor)
+    if best["makespan"] > max_duration:
+        best = None
+    upper = max_duration + 1 if best is None else best["makespan"]
+    lower = int(master.makespan.lowBound)
+    iterations = 0
+    while lower < upper and (gap is None or upper > max_duration or (upper - lower) / upper > gap):
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        solver.timeLimit = None
+        if deadline is not None:
+            if time.perf_counter() >= deadline:
+                break
+            solver.timeLimit = max(1, deadline - time.perf_counter())
+
+        # Only assignments that can beat the best schedule are of interest
+        master.makespan.upBound = upper - 1
+        solver.optionsDict["warmStart"] = False
+        solver.optionsDict["gapRel"] = None
+        solution, infeasible = master.solve(solver)
+        if infeasible:
+            lower = upper
+            break
+        if solution is None:
+            break
+        types, master_bound = solution
+        lower = max(lower, master_bound)
+        if lower >= upper:
+            break
+
+        # Sequence the tasks on the processors of their type, below the best makespan so far
+        iterations += 1
+        allowed = processor_type[:, None] == types[None, :]
+        horizon = upper - 1
+        initial = list_schedule(tasks, predecessors, processors, time_costs_per_processor, allowed=allowed)
+        if initial["makespan"] <= horizon:
+            best = initial
+            upper = horizon = initial["makespan"]
+        bound = master_bound
+        if initial["makespan"] > master_bound:
+            model = build_model("disjunctive", tasks, predecessors, processors, time_costs_per_processor, horizon, allowed=allowed, **options)
+            solver.optionsDict["warmStart"] = initial["makespan"] <= horizon and model.set_initial(initial)
+            solver.timeLimit = subproblem_time_limit
+            if deadline is not None:
+                solver.timeLimit = max(1, min(subproblem_time_limit or math.inf, deadline - time.perf_counter()))
+            solver.optionsDict["gapRel"] = subproblem_gap
+            result, record = solve_with_metrics(model, solver)
+            if metrics is not None:
+                metrics.emit(dict(record, decomposition=True, iteration=iterations, master_bound=master_bound, **options))
+            if result["makespan"] is not None and result["makespan"] < upper:
+                best = result
+                upper = result["makespan"]
+            if result["proven"]:
+                bound = result["makespan"]
+            elif model.prob.status == LpStatusInfeasible:
+                bound = horizon + 1
+            elif record["bound"] is not None:
+                bound = max(bound, math.ceil(record["bound"] - 1e-6))
+        else:
+            bound = initial["makespan"]
+        master.add_cut(types, bound)
+
+    solver.timeLimit = solver_time_limit
+    solver.optionsDict["gapRel"] = subproblem_gap
+    schedule = None if best is None else best["schedule"]
+    if lower >= upper:
+        status = "Optimal" if schedule is not None else "Infeasible"
+    else:
+        status = "Feasible" if schedule is not None else "Not Solved"
+    return {
+        "makespan": None if schedule is None else schedule.makespan,
+        "start_times": {} if schedule is None else schedule.start_times(),
+        "assignment": {} if schedule is None else schedule.assignment(),
+        "schedule": schedule,
+        "status": status,
+        "build_time": build_time,
+        "wall_time": time.perf_counter() - solve_start,
+        "formulation": "benders",
+        "exact": True,
+        "proven": status == "Optimal",
+        "bound": min(lower, upper),
+        "iterations": iterations,
+    }
@@ -0,0 +1,507 @@
+import math
+import sys
+import time
+
+import numpy as np
+from pulp import (PULP_CBC_CMD, LpAffineExpression, LpBinary, LpConstraint, LpConstraintEQ, LpConstraintGE, LpConstraintLE, LpInteger,
+                  LpMinimize, LpProblem, LpSolutionIntegerFeasible, LpSolutionOptimal, LpStatus, LpVariable, lpSum, value)
+
+from dag import DagIndex
+from schedule import Schedule
+
+# Every formulation builds its LpProblem from the same inputs:
+#   tasks                     task names
+#   predecessors              for every task the indices of its immediate predecessors
+#   processors                processor names
+#   time_costs_per_processor  execution time of every task on every processor
+#   max_duration              horizon, the makespan cannot be larger
+# and returns its result through ScheduleModel.solve as the same result dict.
+
+
+class ScheduleModel:
+    name = None
+    # False if the model approximates the instance, its optimum is then not the true optimum
+    exact = True
+    # The big-M coefficients of the formulation, for metrics.model_size
+    big_m = None
+
+    def __init__(self, tasks, predecessors, processors, time_costs_per_processor, max_duration):
+        self.tasks = tasks
+        self.predecessors = predecessors
+        self.processors = processors
+        self.time_costs_per_processor = time_costs_per_processor
+        self.max_duration = max_duration
+        self.prob = LpProblem("schedule_problem", LpMinimize)
+        self.build_time = None
+        # The last solve was allowed to stop at a relative gap, its "optimum" is then not proven
+        self.gap_limited = False
+
+    def solution(self):
+        # Processor index and start time of every task from the variable values, as arrays
+        raise NotImplementedError
+
+    def set_initial(self, result):
+        # Set the variables to a known schedule so the solver can start from it, returns whether
+        # the formulation supports it
+        return False
+
+    def set_lower_bound(self, bound):
+        # A valid lower bound on the makespan, e.g. from bounds.makespan_lower_bound. The solver
+        # stops as soon as it finds a schedule that reaches it. A bound above the horizon means there
+        # is no schedule, it is clamped so the solver reports that instead of rejecting the bounds.
+        self.makespan.lowBound = min(bound, self.makespan.upBound)
+
+    def solve(self, solver=None):
+        self.gap_limited = solver is not None and bool(solver.optionsDict.get("gapRel"))
+        solve_start = time.perf_counter()
+        results = self.prob.solve(solver)
+        wall_time = time.perf_counter() - solve_start
+        status = LpStatus[results]
+        # To stderr, stdout is left to the results
+        print(status, file=sys.stderr)
+        print("objective: ", value(self.prob.objective), file=sys.stderr)
+        return self.extract(status, wall_time)
+
+    def current_schedule(self):
+        # The schedule held by the variables, also while the solver is still running. None if not
+        # every task is assigned. The makespan is that of the schedule itself, also when the model rounds durations.
+        processor, start = self.solution()
+        if (processor < 0).any():
+            return None
+        return Schedule.from_arrays(self.tasks, self.processors, self.time_costs_per_processor, processor, start)
+
+    def extract(self, status, wall_time):
+        schedule = None
+        # Only read the variables if the solver found a schedule
+        if self.prob.sol_status in (LpSolutionOptimal, LpSolutionIntegerFeasible):
+            schedule = self.current_schedule()
+        return {
+            "makespan": None if schedule is None else schedule.makespan,
+            "start_times": {} if schedule is None else schedule.start_times(),
+            "assignment": {} if schedule is None else schedule.assignment(),
+            "schedule": schedule,
+            "status": status,
+            "build_time": self.build_time,
+            "wall_time": wall_time,
+            "formulation": self.name,
+            "exact": self.exact,
+            # The solver proved the schedule optimal, "Optimal" alone also covers a solve stopped at a
+            # limit. Stopping at a time limit leaves the solution integer feasible, at a gap it does not.
+            "proven": self.prob.sol_status == LpSolutionOptimal and not self.gap_limited,
+        }
+
+
+class DisjunctiveModel(ScheduleModel):
+    # Assignment variables per (processor, task) and a big-M disjunction per pair of tasks
+    name = "disjunctive"
+
+    def __init__(self, tasks, predecessors, processors, time_costs_per_processor, max_duration, symmetry_breaking=None, big_m="global", allowed=None):
+        # allowed[a][j] is False if task j cannot run on processor a, a task that is allowed on a
+        # single processor type is then only sequenced against the tasks that can share its processors
+        super().__init__(tasks, predecessors, processors, time_costs_per_processor, max_duration)
+        prob = self.prob
+        n_tasks = len(tasks)
+        n_processors = len(processors)
+        # Execution time of task j on processor a is costs[a, j]
+        costs = np.asarray(time_costs_per_processor, dtype=np.int64).reshape(n_processors, n_tasks)
+        allowed = np.ones((n_processors, n_tasks), dtype=bool) if allowed is None else np.asarray(allowed, dtype=bool)
+
+        # Predecessor of each task
+        P = np.zeros((n_tasks, n_tasks), dtype=bool)
+        for i in range(n_tasks):
+            P[i, predecessors[i]] = True
+        # Pairs of different tasks where neither transitively precedes the other, only those can overlap
+        dag = DagIndex(predecessors)
+        Q = np.array([[dag.comparable(j, k) for k in range(n_tasks)] for j in range(n_tasks)], dtype=bool)
+        free_pairs = ~Q & ~np.eye(n_tasks, dtype=bool) & (allowed.T.astype(np.int64) @ allowed > 0)
+
+        possible_schedule = [(processor, task) for processor in processors for task in tasks]
+        schedule = LpVariable.dicts("schedule", possible_schedule, 0, 1, LpInteger)
+        # x[a][j] is the assignment variable of task j on processor a
+        x = [[schedule[(processor, task)] for task in tasks] for processor in processors]
+
+        # Bound the starting times by the longest paths before and after each task with the shortest
+        # execution times, the makespan is at most max_duration
+        min_costs = np.where(allowed, costs, costs.max()).min(axis=0)
+        max_costs = np.where(allowed, costs, 0).max(axis=0)
+        earliest_start = np.array(dag.earliest_starts(min_costs.tolist()), dtype=np.int64)
+        # Below the critical path there is no schedule, the bounds are clamped so the solver reports
+        # the model infeasible instead of rejecting an empty variable range
+        latest_start = np.maximum(earliest_start, np.array(dag.latest_starts(min_costs.tolist(), max_duration), dtype=np.int64))
+        starting_times = [LpVariable("T_start" + str(i), int(earliest_start[i]), int(latest_start[i]), LpInteger) for i in range(n_tasks)]
+
+        # Only pairs of tasks that can overlap need a disjunction binary
+        overlapping_jobs = [LpVariable("OJ" + str(j) +'-' + str(k), 0, 1, LpInteger) if free_pairs[j, k] else None for j in range(n_tasks) for k in range(n_tasks)]
+        makespan = LpVariable("makespan", 0, max_duration, LpInteger)
+
+        # Objective funtion
+        prob += makespan
+
+        # Duration of every task given its assignment, built once and reused by all pairs
+        duration = [[(x[a][j], int(costs[a, j])) for a in range(n_processors) if allowed[a, j]] for j in range(n_tasks)]
+        for a, j in np.argwhere(~allowed):
+            x[a][j].upBound = 0
+
+        constraints = []
+        # Constraints
+        # The makespan is the maximum of all finishing times
+        for a, j in np.argwhere(allowed):
+            constraints.append(LpConstraint(LpAffineExpression([(makespan, 1), (starting_times[j], -1), (x[a][j], -int(costs[a, j]))]), LpConstraintGE, rhs=0))
+
+        # Each task is assigned to exactly one processor
+        for j in range(n_tasks):
+            constraints.append(LpConstraint(LpAffineExpression([(x[a][j], 1) for a in range(n_processors) if allowed[a, j]]), LpConstraintEQ, rhs=1))
+
+        # Big-M of the non-overlap constraints. "global" uses one value for every pair, the horizon plus
+        # the longest execution time, which bounds the gap between any two tasks. "tight" the
+        # smallest value that is valid for the pair given the start time bounds and the horizon.
+        if big_m == "tight":
+            # starting_times[k] - duration of j - starting_times[j] lies within [-m_before, m_after]
+            m_before = np.maximum(0, (latest_start + max_costs)[:, None] - earliest_start[None, :])
+            m_after = np.maximum(0, latest_start[None, :] - (min_costs + earliest_start)[:, None])
+        elif big_m == "global":
+            m_before = m_after = np.full((n_tasks, n_tasks), max_duration + int(max_costs.max(initial=0)))
+        else:
+            raise ValueError("Unknown big-M mode: %s" % big_m)
+
+        # If a task is schedule on the same processor as another task, they cannot overlap
+        for j, k in np.argwhere(np.triu(free_pairs)):
+            for a in np.flatnonzero(allowed[:, j] & allowed[:, k]):
+                constraints.append(LpConstraint(LpAffineExpression([(x[a][j], 1), (x[a][k], 1), (overlapping_jobs[j*n_tasks+k], 1), (overlapping_jobs[k*n_tasks+j], 1)]), LpConstraintLE, rhs=3))
+        for j, k in np.argwhere(free_pairs):
+            oj = overlapping_jobs[j*n_tasks+k]
+            gap = [(starting_times[k], 1), (starting_times[j], -1)] + [(var, -cost) for var, cost in duration[j]]
+            # starting_times[k] - duration of j - starting_times[j] >= - m_before * oj
+            constraints.append(LpConstraint(LpAffineExpression(gap + [(oj, int(m_before[j, k]))]), LpConstraintGE, rhs=0))
+            # starting_times[k] - duration of j - starting_times[j] <= m_after * (1 - oj)
+            constraints.append(LpConstraint(LpAffineExpression(gap + [(oj, int(m_after[j, k]))]), LpConstraintLE, rhs=int(m_after[j, k])))
+
+        # A task can only be schedule after the end of its predecessor on all processors
+        for i, j in np.argwhere(P):
+            for a in np.flatnonzero(allowed[:, j]):
+                constraints.append(LpConstraint(LpAffineExpression([(starting_times[i], 1), (starting_times[j], -1), (x[a][j], -int(costs[a, j]))]), LpConstraintGE, rhs=0))
+        # With a single task without predecessors every other task waits for it, so it can start at 0
+        sources = [j for j in range(n_tasks) if not predecessors[j]]
+        if len(sources) == 1:
+            constraints.append(LpConstraint(LpAffineExpression([(starting_times[sources[0]], 1)]), LpConstraintEQ, rhs=0))
+
+        # Processors with the same time costs are interchangeable, only keep one labelling of them.
+        # "index": the n-th processor of a type can only run tasks from the n-th task onwards.
+        # "first-task": processors are ordered by their first task, a processor can only run task j
+        # if the previous processor of its type runs a task before j, so unused processors come last.
+        if symmetry_breaking not in (None, "index", "first-task"):
+            raise ValueError("Unknown symmetry breaking: %s" % symmetry_breaking)
+        if symmetry_breaking is not None:
+            unit = 0
+            for a in range(n_processors):
+                if a == 0 or not np.array_equal(costs[a], costs[a - 1]):
+                    unit = 0
+                    continue
+                unit += 1
+                for j in range(n_tasks):
+                    if symmetry_breaking == "index":
+                        if j < unit:
+                            constraints.append(LpConstraint(LpAffineExpression([(x[a][j], 1)]), LpConstraintEQ, rhs=0))
+                    else:
+                        constraints.append(LpConstraint(LpAffineExpression([(x[a][j], 1)] + [(x[a - 1][k], -1) for k in range(j)]), LpConstraintLE, rhs=0))
+
+        for constraint in constraints:
+            prob.addConstraint(constraint)
+
+        self.schedule = schedule
+        self.starting_times = starting_times
+        self.overlapping_jobs = overlapping_jobs
+        self.makespan = makespan
+        self.symmetry_breaking = symmetry_breaking
+        self.big_m = np.concatenate([m_before[free_pairs], m_after[free_pairs]])
+
+    def solution(self):
+        x = np.array([[self.schedule[(processor, task)].varValue or 0 for task in self.tasks] for processor in self.processors])
+        processor = np.where(x.max(axis=0) > 0.5, x.argmax(axis=0), -1)
+        start = np.array([variable.varValue or 0 for variable in self.starting_times])
+        return processor, start
+
+    def relabel(self, assignment):
+        # Relabel interchangeable processors by their first task, that labelling satisfies both
+        # symmetry breaking modes. Processors without a task come last.
+        tasks = self.tasks
+        processors = self.processors
+        first_task = {processor: len(tasks) for processor in processors}
+        for task, processor in assignment.items():
+            first_task[processor] = min(first_task[processor], tasks.index(task))
+        relabel = {}
+        groups = {}
+        for a, processor in enumerate(processors):
+            groups.setdefault(tuple(self.time_costs_per_processor[a]), []).append(processor)
+        for members in groups.values():
+            for old, new in zip(sorted(members, key=lambda processor: first_task[processor]), members):
+                relabel[old] = new
+        return {task: relabel[processor] for task, processor in assignment.items()}
+
+    def initial_assignment(self, result):
+        if self.symmetry_breaking is not None:
+            return self.relabel(result["assignment"])
+        return dict(result["assignment"])
+
+    def set_initial(self, result):
+        tasks = self.tasks
+        processors = self.processors
+        assignment = self.initial_assignment(result)
+        start = [result["start_times"][task] for task in tasks]
+        duration = [self.time_costs_per_processor[processors.index(assignment[task])][j] for j, task in enumerate(tasks)]
+        for processor in processors:
+            for task in tasks:
+                self.schedule[(processor, task)].setInitialValue(1 if assignment[task] == processor else 0)
+        for j in range(len(tasks)):
+            self.starting_times[j].setInitialValue(start[j])
+            for k in range(len(tasks)):
+                # 0 if task k starts after task j has finished
+                if self.overlapping_jobs[j*len(tasks)+k] is not None:
+                    self.overlapping_jobs[j*len(tasks)+k].setInitialValue(0 if start[k] >= start[j] + duration[j] else 1)
+        self.makespan.setInitialValue(max(start[j] + duration[j] for j in range(len(tasks))))
+        return True
+
+
+class CostModel(DisjunctiveModel):
+    # The disjunctive model over a pool of processors, with a binary per processor that is 1 if it
+    # runs any task. processor_costs[a] is the price of processor a, the model picks the processors
+    # as well as the schedule. objective:
+    #   "cost"      the cheapest processors, then the shortest makespan on them
+    #   "makespan"  the shortest makespan, then the cheapest processors that reach it
+    #   "weighted"  makespan + weight * cost
+    name = "cost"
+
+    def __init__(self, tasks, predecessors, processors, time_costs_per_processor, max_duration, processor_costs=None, objective="cost", weight=1, **options):
+        super().__init__(tasks, predecessors, processors, time_costs_per_processor, max_duration, **options)
+        if processor_costs is None or len(processor_costs) != len(processors):
+            raise ValueError("Expected a cost for each of the %d processors" % len(processors))
+        costs = np.asarray(time_costs_per_processor, dtype=np.int64)
+        used = [LpVariable("used_" + str(processor), 0, 1, LpBinary) for processor in processors]
+        cost = LpVariable("cost", 0, sum(processor_costs))
+        self.prob += LpConstraint(LpAffineExpression([(cost, 1)] + [(used[a], -processor_costs[a]) for a in range(len(processors))]), LpConstraintEQ, rhs=0)
+
+        # A processor that runs a task is paid for
+        for a, processor in enumerate(processors):
+            for task in tasks:
+                if self.schedule[(processor, task)].upBound != 0:
+                    self.prob += LpConstraint(LpAffineExpression([(used[a], 1), (self.schedule[(processor, task)], -1)]), LpConstraintGE, rhs=0)
+        # The work on a processor fits within the makespan, and within the horizon only if it is used.
+        # Neither cuts off a schedule, they make the relaxation count the processors the work needs.
+        self.load = []
+        for a, processor in enumerate(processors):
+            work = [(self.schedule[(processor, task)], int(costs[a, j])) for j, task in enumerate(tasks)]
+            self.prob += LpConstraint(LpAffineExpression(work + [(self.makespan, -1)]), LpConstraintLE, rhs=0)
+            load = LpConstraint(LpAffineExpression(work + [(used[a], -max_duration)]), LpConstraintLE, rhs=0)
+            self.prob += load
+            self.load.append(load)
+        # Interchangeable processors are used in order, the unused ones of a type come last
+        for a in range(1, len(processors)):
+            if np.array_equal(costs[a], costs[a - 1]) and processor_costs[a] == processor_costs[a - 1]:
+                self.prob += LpConstraint(LpAffineExpression([(used[a], 1), (used[a - 1], -1)]), LpConstraintLE, rhs=0)
+
+        if objective == "weighted":
+            self.prob.setObjective(LpAffineExpression([(self.makespan, 1), (cost, weight)]))
+        elif objective not in ("cost", "makespan"):
+            raise ValueError("Unknown objective: %s" % objective)
+
+        self.processor_costs = processor_costs
+        self.used = used
+        self.cost = cost
+        self.objective = objective
+
+    def set_horizon(self, max_duration):
+        # Only schedules with a makespan of at most max_duration, below the horizon the model was built for
+        self.makespan.upBound = max_duration
+        for load, used in zip(self.load, self.used):
+            load.expr[used] = -max_duration
+
+    def initial_assignment(self, result):
+        # Interchangeable processors are used in order, so the start schedule always goes to the first
+        # processors of each type, otherwise the solver would reject it
+        return self.relabel(result["assignment"])
+
+    def set_initial(self, result):
+        super().set_initial(result)
+        # The assignment has been relabelled, the used processors follow the one that was set
+        for a, processor in enumerate(self.processors):
+            self.used[a].setInitialValue(int(any(self.schedule[(processor, task)].varValue for task in self.tasks)))
+        self.cost.setInitialValue(sum(cost * used.varValue for cost, used in zip(self.processor_costs, self.used)))
+        return True
+
+    def solve(self, solver=None):
+        # A lexicographic objective takes two solves: the first objective, then the second with the
+        # first bounded by its optimum. Each solve gets the time limit of the solver.
+        if self.objective == "weighted":
+            return super().solve(solver)
+        first, second = (self.cost, self.makespan) if self.objective == "cost" else (self.makespan, self.cost)
+        self.prob.setObjective(LpAffineExpression([(first, 1)]))
+        result = super().solve(solver)
+        if result["makespan"] is None:
+            return result
+
+        up_bound = first.upBound
+        first.upBound = result["cost"] if first is self.cost else result["makespan"]
+        self.prob.setObjective(LpAffineExpression([(second, 1)]))
+        solver = solver or PULP_CBC_CMD()
+        warm_start = solver.optionsDict.get("warmStart", False)
+        # The schedule of the first solve is optimal for it, the second starts from there
+        solver.optionsDict["warmStart"] = self.set_initial(result)
+        try:
+            second_result = super().solve(solver)
+        finally:
+            solver.optionsDict["warmStart"] = warm_start
+            first.upBound = up_bound
+        if second_result["makespan"] is None:
+            second_result = dict(result, proven=False)
+        return dict(second_result, wall_time=result["wall_time"] + second_result["wall_time"], proven=result["proven"] and second_result["proven"])
+
+    def extract(self, status, wall_time):
+        # The processors that run a task and their total cost
+        result = super().extract(status, wall_time)
+        used = set(result["assignment"].values())
+        result["used"] = [processor for processor in self.processors if processor in used]
+        result["cost"] = None if result["schedule"] is None else sum(self.processor_costs[a] for a, processor in enumerate(self.processors) if processor in used)
+        return result
+
+
+class TimeIndexedModel(ScheduleModel):
+    # A binary per (processor, task, start slot). Time is divided in slots of time_step, durations are
+    # rounded up to whole slots so the model is exact for time_step=1 and an approximation otherwise.
+    name = "time-indexed"
+
+    def __init__(self, tasks, predecessors, processors, time_costs_per_processor, max_duration, time_step=1):
+        super().__init__(tasks, predecessors, processors, time_costs_per_processor, max_duration)
+        prob = self.prob
+        self.time_step = time_step
+        self.exact = time_step == 1
+        horizon = max_duration // time_step
+        slots = [[math.ceil(costs[j] / time_step) for j in range(len(tasks))] for costs in time_costs_per_processor]
+
+        starts = {}
+        for a in range(len(processors)):
+            for j in range(len(tasks)):
+                for t in range(horizon - slots[a][j] + 1):
+                    starts[(a, j, t)] = LpVariable("x_%d_%d_%d" % (a, j, t), 0, 1, LpBinary)
+        makespan = LpVariable("makespan", 0, horizon, LpInteger)
+        prob += makespan
+
+        task_starts = [[] for j in range(len(tasks))]
+        for (a, j, t), var in starts.items():
+            task_starts[j].append((a, t, var))
+        start_slot = [lpSum([t * var for a, t, var in task_starts[j]]) for j in range(len(tasks))]
+        duration = [lpSum([slots[a][j] * var for a, t, var in task_starts[j]]) for j in range(len(tasks))]
+
+        # Each task starts exactly once
+        for j in range(len(tasks)):
+            prob += lpSum([var for a, t, var in task_starts[j]]) == 1
+            prob += makespan >= start_slot[j] + duration[j]
+
+        # At most one task runs on a processor in every slot
+        for a in range(len(processors)):
+            for s in range(horizon):
+                running = [starts[(a, j, t)] for j in range(len(tasks)) for t in range(max(0, s - slots[a][j] + 1), s + 1) if (a, j, t) in starts]
+                if len(running) > 1:
+                    prob += lpSum(running) <= 1
+
+        # A task starts after its predecessors have finished
+        for i in range(len(tasks)):
+            for j in predecessors[i]:
+                prob += start_slot[i] >= start_slot[j] + duration[j]
+
+        self.starts = starts
+        self.makespan = makespan
+
+    def set_lower_bound(self, bound):
+        # The makespan is in slots, the rounded durations only make the schedule longer
+        self.makespan.lowBound = min(-(-bound // self.time_step), self.makespan.upBound)
+
+    def solution(self):
+        processor = np.full(len(self.tasks), -1)
+        start = np.zeros(len(self.tasks))
+        for (a, j, t), var in self.starts.items():
+            if var.varValue is not None and var.varValue > 0.5:
+                processor[j] = a
+                start[j] = t * self.time_step
+        return processor, start
+
+
+class SequenceModel(ScheduleModel):
+    # Every processor has a sequence of positions, each task takes exactly one (processor, position).
+    # The completion time of a position follows from the previous position on the same processor.
+    name = "sequence"
+
+    def __init__(self, tasks, predecessors, processors, time_costs_per_processor, max_duration):
+        super().__init__(tasks, predecessors, processors, time_costs_per_processor, max_duration)
+        prob = self.prob
+        positions = range(len(tasks))
+
+        place = LpVariable.dicts("y", [(a, j, q) for a in range(len(processors)) for j in range(len(tasks)) for q in positions], 0, 1, LpBinary)
+        completion = LpVariable.dicts("C", [(a, q) for a in range(len(processors)) for q in positions], 0, max_duration, LpInteger)
+        starting_times = [LpVariable("T_start" + str(j), 0, max_duration, LpInteger) for j in range(len(tasks))]
+        makespan = LpVariable("makespan", 0, max_duration, LpInteger)
+        prob += makespan
+
+        duration = [lpSum([time_costs_per_processor[a][j] * place[(a, j, q)] for a in range(len(processors)) for q in positions]) for j in range(len(tasks))]
+
+        # Each task takes exactly one position, each position holds at most one task
+        for j in range(len(tasks)):
+            prob += lpSum([place[(a, j, q)] for a in range(len(processors)) for q in positions]) == 1
+            prob += makespan >= starting_times[j] + duration[j]
+        for a in range(len(processors)):
+            for q in positions:
+                prob += lpSum([place[(a, j, q)] for j in range(len(tasks))]) <= 1
+                # Positions are filled from the front
+                if q > 0:
+                    prob += lpSum([place[(a, j, q)] for j in range(len(tasks))]) <= lpSum([place[(a, j, q - 1)] for j in range(len(tasks))])
+
+        # A position completes after the previous position and after its own task, which cannot start
+        # before the previous position has completed
+        big_m = []
+        for a in range(len(processors)):
+            for q in positions:
+                prob += completion[(a, q)] >= lpSum([time_costs_per_processor[a][j] * place[(a, j, q)] for j in range(len(tasks))]) + (completion[(a, q - 1)] if q > 0 else 0)
+                for j in range(len(tasks)):
+                    # A task can start late on another processor and still end after the horizon
+                    # here, so the big-M covers its execution time on this processor as well
+                    m = max_duration + time_costs_per_processor[a][j]
+                    prob += completion[(a, q)] >= starting_times[j] + time_costs_per_processor[a][j] - m * (1 - place[(a, j, q)])
+                    big_m.append(m)
+                    if q > 0:
+                        prob += starting_times[j] >= completion[(a, q - 1)] - m * (1 - place[(a, j, q)])
+                        big_m.append(m)
+
+        # A task starts after its predecessors have finished
+        for i in range(len(tasks)):
+            for j in predecessors[i]:
+                prob += starting_times[i] >= starting_times[j] + duration[j]
+
+        self.place = place
+        self.starting_times = starting_times
+        self.makespan = makespan
+        # The big-M of the two position constraints of every (processor, task, position) but the first position
+        self.big_m = np.array(big_m)
+
+    def solution(self):
+        processor = np.full(len(self.tasks), -1)
+        for (a, j, q), var in self.place.items():
+            if var.varValue is not None and var.varValue > 0.5:
+                processor[j] = a
+        start = np.array([variable.varValue or 0 for variable in self.starting_times])
+        return processor, start
+
+
+FORMULATIONS = {
+    DisjunctiveModel.name: DisjunctiveModel,
+    CostModel.name: CostModel,
+    TimeIndexedModel.name: TimeIndexedModel,
+    SequenceModel.name: SequenceModel,
+}
+
+
+def build_model(formulation, tasks, predecessors, processors, time_costs_per_processor, max_duration, **options):
+    if formulation not in FORMULATIONS:
+        raise ValueError("Unknown formulation: %s" % formulation)
+    build_start = time.perf_counter()
+    model = FORMULATIONS[formulation](tasks, predecessors, processors, time_costs_per_processor, max_duration, **options)
+    model.build_time = time.perf_counter() - build_start
+    return model
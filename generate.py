@@ -0,0 +1,74 @@
+import math
+import random
+
+from instance import Instance
+
+# Random instances for benchmarking. Every task gets a base execution time from the cost
+# distribution, the time on each processor type is that base time scaled by a random factor
+# in [1 - heterogeneity, 1 + heterogeneity].
+
+
+def random_costs(n_tasks, processor_types, rng, distribution="uniform", low=10, high=100, heterogeneity=0.5):
+    if distribution == "uniform":
+        base = [rng.uniform(low, high) for j in range(n_tasks)]
+    elif distribution == "lognormal":
+        # Mostly short tasks with a few long ones, the median halfway between low and high
+        mu = math.log((low + high) / 2)
+        base = [min(max(rng.lognormvariate(mu, 0.75), low), 10 * high) for j in range(n_tasks)]
+    else:
+        raise ValueError("Unknown cost distribution: %s" % distribution)
+    return [[max(1, round(b * rng.uniform(1 - heterogeneity, 1 + heterogeneity))) for b in base] for processor_type in processor_types]
+
+
+def layered_dag(n_tasks, n_layers, rng, edge_probability=0.2):
+    # Tasks are spread over the layers, each task after the first layer waits for at least one task
+    # of the layer before it and for every other task of that layer with the edge probability
+    n_layers = max(1, min(n_layers, n_tasks))
+    layer_of = sorted([l for l in range(n_layers)] + [rng.randrange(n_layers) for j in range(n_tasks - n_layers)])
+    layers = [[] for l in range(n_layers)]
+    for j, l in enumerate(layer_of):
+        layers[l].append(j)
+
+    predecessors = [[] for j in range(n_tasks)]
+    for l in range(1, n_layers):
+        for j in layers[l]:
+            preds = {rng.choice(layers[l - 1])}
+            preds.update(i for i in layers[l - 1] if rng.random() < edge_probability)
+            predecessors[j] = sorted(preds)
+    return predecessors
+
+
+def series_parallel_dag(n_tasks, rng, parallel_probability=0.5):
+    # Recursively split the tasks in two halves that run one after the other (series) or next to each
+    # other (parallel). In series every sink of the first half is a predecessor of every source of the second.
+    predecessors = [[] for j in range(n_tasks)]
+
+    def compose(first, last):
+        # Returns the sources and sinks of the graph over tasks first..last-1
+        if last - first == 1:
+            return [first], [first]
+        middle = rng.randint(first + 1, last - 1)
+        sources_a, sinks_a = compose(first, middle)
+        sources_b, sinks_b = compose(middle, last)
+        if rng.random() < parallel_probability:
+            return sources_a + sources_b, sinks_a + sinks_b
+        for j in sources_b:
+            predecessors[j] = sorted(predecessors[j] + sinks_a)
+        return sources_a, sinks_b
+
+    compose(0, n_tasks)
+    return predecessors
+
+
+def random_instance(n_tasks, shape="layered", processor_types=("A", "B"), seed=0, distribution="uniform", **options):
+    # options go to the DAG generator: n_layers and edge_probability for layered, parallel_probability for series-parallel
+    rng = random.Random(seed)
+    if shape == "layered":
+        predecessors = layered_dag(n_tasks, options.pop("n_layers", max(1, round(math.sqrt(n_tasks)))), rng, **options)
+    elif shape == "series-parallel":
+        predecessors = series_parallel_dag(n_tasks, rng, **options)
+    else:
+        raise ValueError("Unknown DAG shape: %s" % shape)
+    time_costs = random_costs(n_tasks, processor_types, rng, distribution)
+    tasks = ["T" + str(j + 1) for j in range(n_tasks)]
+    return Instance(tasks, processor_types, time_costs, predecessors, name="%s-%d-%s-%d" % (shape, n_tasks, distribution, seed))
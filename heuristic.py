@@ -0,0 +1,82 @@
+import bisect
+import time
+
+from dag import topological_order
+from schedule import Schedule
+
+
+def upward_ranks(predecessors, time_costs_per_processor):
+    # Length of the longest path from each task to the end of the DAG, with the mean execution time per task
+    n_tasks = len(predecessors)
+    mean_costs = [sum(costs[j] for costs in time_costs_per_processor) / len(time_costs_per_processor) for j in range(n_tasks)]
+    order, successors = topological_order(predecessors)
+    ranks = [0] * n_tasks
+    for j in reversed(order):
+        ranks[j] = mean_costs[j] + max([ranks[s] for s in successors[j]], default=0)
+    return ranks, order
+
+
+def no_schedule(solve_start):
+    # The result when a task has no processor to run on, like that of an infeasible model
+    return {
+        "makespan": None,
+        "start_times": {},
+        "assignment": {},
+        "schedule": None,
+        "status": "Infeasible",
+        "wall_time": time.perf_counter() - solve_start,
+        "formulation": "heft",
+        "exact": False,
+    }
+
+
+def list_schedule(tasks, predecessors, processors, time_costs_per_processor, allowed=None):
+    # HEFT: take the tasks by decreasing upward rank and put every task on the processor where it
+    # finishes first, using idle gaps between already scheduled tasks. With allowed, task j is
+    # only placed on the processors a with allowed[a][j].
+    solve_start = time.perf_counter()
+    if not processors:
+        return no_schedule(solve_start)
+    ranks, topological = upward_ranks(predecessors, time_costs_per_processor)
+    # Ties (zero execution times) are broken by the topological order so predecessors still go first
+    position = {j: p for p, j in enumerate(topological)}
+    order = sorted(range(len(tasks)), key=lambda j: (-ranks[j], position[j]))
+
+    busy = [[] for processor in processors]
+    # End times of the busy intervals, also sorted, to skip the intervals that end before a task is ready
+    ends = [[] for processor in processors]
+    start = [None] * len(tasks)
+    finish = [None] * len(tasks)
+    placed_on = [None] * len(tasks)
+    for j in order:
+        ready = max([finish[i] for i in predecessors[j]], default=0)
+        best = None
+        for a in range(len(processors)):
+            if allowed is not None and not allowed[a][j]:
+                continue
+            duration = time_costs_per_processor[a][j]
+            begin = ready
+            for i in range(bisect.bisect_right(ends[a], ready), len(busy[a])):
+                busy_start, busy_end = busy[a][i]
+                if begin + duration <= busy_start:
+                    break
+                begin = max(begin, busy_end)
+            if best is None or begin + duration < best[1]:
+                best = (begin, begin + duration, a)
+        if best is None:
+            return no_schedule(solve_start)
+        start[j], finish[j], placed_on[j] = best
+        bisect.insort(busy[placed_on[j]], (start[j], finish[j]))
+        bisect.insort(ends[placed_on[j]], finish[j])
+
+    schedule = Schedule.from_arrays(tasks, processors, time_costs_per_processor, placed_on, start)
+    return {
+        "makespan": schedule.makespan,
+        "start_times": schedule.start_times(),
+        "assignment": schedule.assignment(),
+        "schedule": schedule,
+        "status": "Heuristic",
+        "wall_time": time.perf_counter() - solve_start,
+        "formulation": "heft",
+        "exact": False,
+    }
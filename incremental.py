@@ -0,0 +1,97 @@
+from pulp import PULP_CBC_CMD
+
+from dag import DagIndex
+from formulations import build_model
+from heuristic import list_schedule
+from metrics import solve_with_metrics
+
+
+class IncrementalModel:
+    # One disjunctive model over the largest processor set of a sweep. A configuration with fewer
+    # processors is solved by fixing the assignment variables of the unused processors to 0 and
+    # lowering the horizon, so the model is built once instead of once per configuration.
+    # Unused processors are always the last ones of their type, which keeps the symmetry breaking valid.
+    def __init__(self, instance, max_counts, max_duration, **options):
+        self.instance = instance
+        self.max_counts = {processor_type: max_counts.get(processor_type, 0) for processor_type in instance.processor_types}
+        self.max_duration = max_duration
+        self.processors, self.time_costs_per_processor = instance.processors(self.max_counts)
+        self.model = build_model("disjunctive", instance.tasks, instance.predecessors, self.processors,
+                                 self.time_costs_per_processor, max_duration, **options)
+        self.dag = DagIndex(instance.predecessors)
+        # Schedules found so far per configuration, a schedule stays feasible when processors are added
+        self.solutions = {}
+
+    def active_processors(self, counts):
+        for processor_type, count in counts.items():
+            if count > self.max_counts.get(processor_type, 0):
+                raise ValueError("The model has %d processors of type %s, %d requested" % (self.max_counts.get(processor_type, 0), processor_type, count))
+        return self.instance.processors(counts)
+
+    def activate(self, counts, max_duration, lower_bound=None):
+        # Fix the assignment of the unused processors to 0 and bound the start times by the new horizon
+        # and the makespan by the lower bound of the configuration
+        model = self.model
+        processors, time_costs_per_processor = self.active_processors(counts)
+        for processor in self.processors:
+            for task in self.instance.tasks:
+                model.schedule[(processor, task)].upBound = 1 if processor in processors else 0
+        min_costs = [min(costs[j] for costs in time_costs_per_processor) for j in range(len(self.instance.tasks))]
+        for variable, tail in zip(model.starting_times, self.dag.tails(min_costs)):
+            variable.upBound = max(variable.lowBound, max_duration - tail)
+        model.makespan.upBound = max_duration
+        model.set_lower_bound(0 if lower_bound is None else lower_bound)
+
+    def initial_schedule(self, counts, max_duration):
+        # The best schedule of a configuration with at most as many processors of every type,
+        # or the list schedule if none has been solved yet
+        best = None
+        for solved_counts, result in self.solutions.items():
+            if all(dict(solved_counts).get(processor_type, 0) <= counts.get(processor_type, 0) for processor_type in self.max_counts):
+                if best is None or result["makespan"] < best["makespan"]:
+                    best = result
+        processors, time_costs_per_processor = self.active_processors(counts)
+        heuristic = list_schedule(self.instance.tasks, self.instance.predecessors, processors, time_costs_per_processor)
+        if heuristic["makespan"] is not None and (best is None or heuristic["makespan"] < best["makespan"]):
+            best = heuristic
+        if best is None or best["makespan"] > max_duration:
+            return None
+        return best
+
+    def solve(self, counts, max_duration, solver=None, warm_start=True, lower_bound=None, metrics=None, time_limit=None, gap=None):
+        # A start schedule that reaches lower_bound is optimal, it is returned without solving the model.
+        # time_limit (seconds) and gap (relative) stop the solver early, for this solve only.
+        if max_duration > self.max_duration:
+            raise ValueError("The model was built for a horizon of %d, %d requested" % (self.max_duration, max_duration))
+        counts = {processor_type: counts.get(processor_type, 0) for processor_type in self.max_counts}
+        if solver is None:
+            solver = PULP_CBC_CMD()
+        initial = self.initial_schedule(counts, max_duration) if warm_start else None
+        if initial is not None and lower_bound is not None and initial["makespan"] <= lower_bound:
+            result = dict(initial, status="Optimal", exact=True, proven=True)
+        else:
+            if initial is not None:
+                max_duration = int(initial["makespan"])
+            self.activate(counts, max_duration, lower_bound)
+            settings = (solver.timeLimit, solver.optionsDict.get("gapRel"), solver.optionsDict.get("warmStart", False))
+            try:
+                if time_limit is not None:
+                    solver.timeLimit = time_limit
+                if gap is not None:
+                    solver.optionsDict["gapRel"] = gap
+                # The variables still hold the previous solution, only start from it when it is set to a feasible one
+                solver.optionsDict["warmStart"] = initial is not None and self.model.set_initial(initial)
+                if metrics is None:
+                    result = self.model.solve(solver)
+                else:
+                    result, record = solve_with_metrics(self.model, solver)
+                    active = self.active_processors(counts)[0]
+                    metrics.emit(dict(record, incremental=True, processors=len(active), processor_names=active, warm_start=solver.optionsDict["warmStart"]))
+            finally:
+                solver.timeLimit, solver.optionsDict["gapRel"], solver.optionsDict["warmStart"] = settings
+
+        if result["makespan"] is not None:
+            key = tuple(sorted(counts.items()))
+            if key not in self.solutions or result["makespan"] < self.solutions[key]["makespan"]:
+                self.solutions[key] = result
+        return result
@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+import re
+
+# An instance is a DAG of tasks with an execution time per processor type. On disk it is either
+#
+#   JSON lines (.jsonl), streamed one task at a time:
+#     {"name": "part4", "processor_types": ["A", "B"]}
+#     {"task": "T1", "costs": {"A": 821, "B": 576}, "predecessors": []}
+#     {"task": "T2", "costs": {"A": 334, "B": 297}, "predecessors": ["T1"]}
+#
+#   JSON (.json), the same header with all task records in a "tasks" list, or
+#
+#   CSV (.csv), one row per task with a column per processor type and the predecessors
+#   separated by ";":
+#     task,predecessors,A,B
+#     T2,T1,334,297
+#
+# Tasks can have any number of predecessors, which may be listed after the task itself.
+
+
+class Instance:
+    def __init__(self, tasks, processor_types, time_costs, predecessors, name=None):
+        # time_costs[t][j] is the execution time of task j on processor type t,
+        # predecessors[j] the indices of the tasks that have to finish before task j starts
+        self.name = name
+        self.tasks = list(tasks)
+        self.processor_types = list(processor_types)
+        self.time_costs = [list(costs) for costs in time_costs]
+        self.predecessors = [list(preds) for preds in predecessors]
+        if len(self.time_costs) != len(self.processor_types):
+            raise ValueError("Expected time costs for %d processor types, got %d" % (len(self.processor_types), len(self.time_costs)))
+        for costs in self.time_costs:
+            if len(costs) != len(self.tasks):
+                raise ValueError("Expected %d time costs per processor type, got %d" % (len(self.tasks), len(costs)))
+        if len(self.predecessors) != len(self.tasks):
+            raise ValueError("Expected predecessors for %d tasks, got %d" % (len(self.tasks), len(self.predecessors)))
+
+    def processors(self, counts):
+        # Processor names and their time costs for a number of processors per type, e.g. {"A": 2, "B": 1}
+        unknown = set(counts) - set(self.processor_types)
+        if unknown:
+            raise ValueError("Unknown processor types: %s" % ", ".join(sorted(unknown)))
+        processors = []
+        time_costs_per_processor = []
+        for t, processor_type in enumerate(self.processor_types):
+            for i in range(1, 1 + counts.get(processor_type, 0)):
+                processors.append(processor_type + str(i))
+                time_costs_per_processor.append(self.time_costs[t])
+        return processors, time_costs_per_processor
+
+    def processor_costs(self, counts, costs):
+        # Price of every processor of processors(counts), costs is the price per processor type
+        return [costs[processor_type] for processor_type in self.processor_types for i in range(counts.get(processor_type, 0))]
+
+    def count_processors(self, counts, used):
+        # Number of processors per type among the processors used of processors(counts)
+        used = set(used)
+        used_counts = {processor_type: 0 for processor_type in self.processor_types}
+        for processor_type in self.processor_types:
+            for i in range(1, 1 + counts.get(processor_type, 0)):
+                if processor_type + str(i) in used:
+                    used_counts[processor_type] += 1
+        return used_counts
+
+    def serial_makespan(self):
+        # Running the tasks one after the other on their slowest type always fits, the default horizon
+        return sum(max(costs) for costs in zip(*self.time_costs))
+
+    def task_records(self):
+        for j, task in enumerate(self.tasks):
+            yield {
+                "task": task,
+                "costs": {processor_type: self.time_costs[t][j] for t, processor_type in enumerate(self.processor_types)},
+                "predecessors": [self.tasks[i] for i in self.predecessors[j]],
+            }
+
+
+def from_records(header, records):
+    # Build an instance from a header and task records, resolving predecessor names at the end
+    processor_types = header["processor_types"]
+    tasks = []
+    time_costs = [[] for processor_type in processor_types]
+    predecessor_names = []
+    for record in records:
+        tasks.append(record["task"])
+        for t, processor_type in enumerate(processor_types):
+            time_costs[t].append(record["costs"][processor_type])
+        predecessor_names.append(record.get("predecessors", []))
+
+    index = {task: j for j, task in enumerate(tasks)}
+    if len(index) != len(tasks):
+        raise ValueError("Task names are not unique")
+    predecessors = []
+    for task, names in zip(tasks, predecessor_names):
+        missing = [name for name in names if name not in index]
+        if missing:
+            raise ValueError("Unknown predecessors of %s: %s" % (task, ", ".join(missing)))
+        predecessors.append([index[name] for name in names])
+    return Instance(tasks, processor_types, time_costs, predecessors, name=header.get("name"))
+
+
+def iter_jsonl(path):
+    # Header first, then the task records one by one
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_csv(path):
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        processor_types = [field for field in reader.fieldnames if field not in ("task", "predecessors")]
+        yield {"name": os.path.splitext(os.path.basename(path))[0], "processor_types": processor_types}
+        for row in reader:
+            yield {
+                "task": row["task"],
+                "costs": {processor_type: int(row[processor_type]) for processor_type in processor_types},
+                "predecessors": [name for name in (row.get("predecessors") or "").split(";") if name],
+            }
+
+
+def load_instance(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path) as f:
+            data = json.load(f)
+        return from_records(data, data["tasks"])
+    if extension == ".jsonl":
+        records = iter_jsonl(path)
+    elif extension == ".csv":
+        records = iter_csv(path)
+    else:
+        raise ValueError("Unknown instance format: %s" % path)
+    header = next(records)
+    return from_records(header, records)
+
+
+def save_instance(instance, path):
+    with open(path, "w") as f:
+        f.write(json.dumps({"name": instance.name, "processor_types": instance.processor_types}) + "\n")
+        for record in instance.task_records():
+            f.write(json.dumps(record) + "\n")
+
+
+def parse_mix(mix):
+    # "2A1B" -> {"A": 2, "B": 1}
+    return {processor_type: int(count) for count, processor_type in re.findall(r"(\d+)([A-Za-z]+)", mix)}
+
+
+def format_mix(counts):
+    return "".join("%d%s" % (count, processor_type) for processor_type, count in counts.items())
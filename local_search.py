@@ -0,0 +1,168 @@
+import time
+
+import numpy as np
+
+from dag import topological_order
+from heuristic import list_schedule
+from schedule import Schedule
+
+# Tabu search over the processor of every task and the order in which the tasks are placed. A
+# solution is decoded by placing the tasks in that order, each at the end of its predecessors and
+# of the previous task on its processor. Only the tasks on the critical path can shorten the
+# schedule, so the moves are: put a critical task on another processor, or place it before the
+# task it waits for on its own processor. The new finish time of every critical task on every
+# processor is scored in one NumPy expression, only the best moves are decoded, and only from the
+# position of the moved task on, the tasks before it keep their times.
+
+
+class TabuSearch:
+    def __init__(self, tasks, predecessors, processors, time_costs_per_processor, tenure=8, candidates=4, seed=0):
+        self.tasks = tasks
+        self.predecessors = [list(preds) for preds in predecessors]
+        self.processors = processors
+        self.time_costs_per_processor = time_costs_per_processor
+        self.costs = np.asarray(time_costs_per_processor, dtype=np.int64)
+        # Execution times per task as lists, the decoding loop indexes them one by one
+        self.task_costs = self.costs.T.tolist()
+        self.tenure = tenure
+        self.candidates = candidates
+        self.rng = np.random.default_rng(seed)
+
+    def decode(self, processor, order, first=0, finish=None):
+        # Start and finish times and the previous task on the same processor, for the tasks from
+        # position first of the order on. The tasks before it keep their times in finish.
+        n_tasks = len(order)
+        finish = [0] * n_tasks if finish is None else list(finish)
+        available = [0] * len(self.processors)
+        previous = [-1] * len(self.processors)
+        for j in order[:first]:
+            available[processor[j]] = finish[j]
+            previous[processor[j]] = j
+        start = [0] * n_tasks
+        machine_previous = [-1] * n_tasks
+        for j in order[first:]:
+            a = processor[j]
+            ready = available[a]
+            for i in self.predecessors[j]:
+                if finish[i] > ready:
+                    ready = finish[i]
+            start[j] = ready
+            finish[j] = ready + self.task_costs[j][a]
+            machine_previous[j] = previous[a]
+            available[a] = finish[j]
+            previous[a] = j
+        return start, finish, machine_previous
+
+    def makespan_from(self, processor, order, first, finish, prefix_makespan):
+        # Makespan after changing the tasks from position first on, the others are not decoded again
+        finish = self.decode(processor, order, first, finish)[1]
+        return max([prefix_makespan[first]] + [finish[j] for j in order[first:]])
+
+    def critical_path(self, start, finish, machine_previous):
+        # Follow from the last task back through the predecessor or previous task it waited for
+        j = int(np.argmax(finish))
+        path = [j]
+        while start[j] > 0:
+            waited = [i for i in self.predecessors[j] if finish[i] == start[j]]
+            if waited:
+                j = waited[0]
+            elif machine_previous[j] >= 0 and finish[machine_previous[j]] == start[j]:
+                j = machine_previous[j]
+            else:
+                break
+            path.append(j)
+        return path[::-1]
+
+    def run(self, processor, order, time_limit=0.1, max_iterations=None):
+        # Improves the solution until the time limit, returns the best processor list, order and makespan
+        deadline = time.perf_counter() + time_limit
+        n_tasks = len(order)
+        n_processors = len(self.processors)
+        start, finish, machine_previous = self.decode(processor, order)
+        best = (list(processor), list(order), max(finish))
+        tabu_until = np.zeros(n_tasks, dtype=np.int64)
+        iteration = 0
+        while time.perf_counter() < deadline and (max_iterations is None or iteration < max_iterations):
+            iteration += 1
+            position = np.empty(n_tasks, dtype=np.int64)
+            position[order] = np.arange(n_tasks)
+            order_array = np.asarray(order)
+            finish_array = np.asarray(finish, dtype=np.int64)
+            # available[a, p]: when processor a is free before the task at position p
+            available = np.zeros((n_processors, n_tasks + 1), dtype=np.int64)
+            available[np.asarray(processor)[order_array], np.arange(1, n_tasks + 1)] = finish_array[order_array]
+            np.maximum.accumulate(available, axis=1, out=available)
+            prefix_makespan = np.concatenate([[0], np.maximum.accumulate(finish_array[order_array])]).tolist()
+
+            critical = np.array(self.critical_path(start, finish, machine_previous))
+            ready = np.array([max([finish[i] for i in self.predecessors[j]], default=0) for j in critical], dtype=np.int64)
+            # Finish time of every critical task on every processor, with the rest of the schedule as it is
+            moved_finish = np.maximum(ready[:, None], available[:, position[critical]].T) + self.costs[:, critical].T
+            score = moved_finish - finish_array[critical][:, None]
+            score[np.arange(len(critical)), np.asarray(processor)[critical]] = np.iinfo(np.int64).max
+            moves = []
+            for c in np.argsort(score, axis=None)[:self.candidates]:
+                j, a = critical[c // n_processors], c % n_processors
+                if score.flat[c] == np.iinfo(np.int64).max:
+                    break
+                moved = list(processor)
+                moved[j] = int(a)
+                moves.append((self.makespan_from(moved, order, position[j], finish, prefix_makespan), j, moved, order))
+            # Place a critical task before the task it waits for on its processor, if its predecessors
+            # allow, scored by its start time there
+            waits_for = np.array([machine_previous[j] for j in critical])
+            last_predecessor = np.array([max([position[i] for i in self.predecessors[j]], default=-1) for j in critical])
+            movable = (waits_for >= 0) & (ready < np.asarray(start)[critical]) & (last_predecessor < position[waits_for])
+            moved_start = np.maximum(ready, available[np.asarray(processor)[critical], position[waits_for]])
+            for c in np.flatnonzero(movable)[np.argsort(moved_start[movable] - np.asarray(start)[critical][movable], kind="stable")][:self.candidates]:
+                j, k = critical[c], waits_for[c]
+                reordered = list(order)
+                del reordered[position[j]]
+                reordered.insert(position[k], int(j))
+                moves.append((self.makespan_from(processor, reordered, position[k], finish, prefix_makespan), j, processor, reordered))
+
+            # The best move that is not tabu, or that gives the best schedule so far
+            allowed = [move for move in moves if tabu_until[move[1]] < iteration or move[0] < best[2]]
+            if not allowed:
+                tabu_until[:] = 0
+                continue
+            lowest = min(move[0] for move in allowed)
+            ties = [move for move in allowed if move[0] == lowest]
+            new_makespan, j, processor, order = ties[self.rng.integers(len(ties))]
+            tabu_until[j] = iteration + self.tenure
+            start, finish, machine_previous = self.decode(processor, order)
+            if new_makespan < best[2]:
+                best = (list(processor), list(order), new_makespan)
+        return best + (iteration,)
+
+    def schedule(self, processor, order):
+        start = self.decode(processor, order)[0]
+        return Schedule.from_arrays(self.tasks, self.processors, self.time_costs_per_processor, processor, start)
+
+
+def local_search(tasks, predecessors, processors, time_costs_per_processor, time_limit=0.1, max_iterations=None, seed=0, **options):
+    # Starts from the list schedule, the tasks in the order of their start times there. Decoding that
+    # order never starts a task later, so the result is never worse than the list schedule.
+    solve_start = time.perf_counter()
+    initial = list_schedule(tasks, predecessors, processors, time_costs_per_processor)
+    if initial["makespan"] is None:
+        return dict(initial, formulation="tabu", iterations=0)
+    initial = initial["schedule"]
+    search = TabuSearch(tasks, predecessors, processors, time_costs_per_processor, seed=seed, **options)
+    # Ties in the start times (zero execution times) are broken by the topological order
+    topological = np.empty(len(tasks), dtype=np.int64)
+    topological[topological_order(predecessors)[0]] = np.arange(len(tasks))
+    order = np.lexsort((topological, initial.start)).tolist()
+    processor, order, makespan, iterations = search.run(initial.processor.tolist(), order, max(0, time_limit - (time.perf_counter() - solve_start)), max_iterations)
+    schedule = search.schedule(processor, order)
+    return {
+        "makespan": schedule.makespan,
+        "start_times": schedule.start_times(),
+        "assignment": schedule.assignment(),
+        "schedule": schedule,
+        "status": "Heuristic",
+        "wall_time": time.perf_counter() - solve_start,
+        "formulation": "tabu",
+        "exact": False,
+        "iterations": iterations,
+    }
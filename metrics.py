@@ -0,0 +1,132 @@
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+from pulp import COIN_CMD, LpInteger
+
+# Fields of the CBC log: the summary at the end and the bound after the cuts at the root node
+CBC_LOG_FIELDS = {
+    "objective": r"^Objective value:\s+(\S+)",
+    "bound": r"^Lower bound:\s+(\S+)",
+    "gap": r"^Gap:\s+(\S+)",
+    "nodes": r"^Enumerated nodes:\s+(\d+)",
+    "root_bound": r"^Cuts at root node changed objective from \S+ to (\S+)",
+    "root_lp": r"^Continuous objective value is (\S+)",
+    "solver_time": r"^Total time \(CPU seconds\):.*\(Wallclock seconds\):\s+(\S+)",
+}
+
+
+def parse_cbc_log(path):
+    # Node count, bounds and relative gap of a CBC run
+    stats = {}
+    with open(path) as f:
+        log = f.read()
+    for field, pattern in CBC_LOG_FIELDS.items():
+        match = re.findall(pattern, log, re.MULTILINE)
+        if match:
+            stats[field] = float(match[-1])
+    if "nodes" in stats:
+        stats["nodes"] = int(stats["nodes"])
+    # CBC prints -1.79769e+308 for a bound it never computed, e.g. when presolve solves the problem
+    for field in ["bound", "root_bound", "root_lp"]:
+        if field in stats and stats[field] < -1e300:
+            del stats[field]
+    if "root_bound" not in stats and "root_lp" in stats:
+        stats["root_bound"] = stats["root_lp"]
+    stats.pop("root_lp", None)
+    if "Optimal solution found" in log:
+        stats["gap"] = 0.0
+        stats.setdefault("bound", stats.get("objective"))
+    elif "gap" not in stats and "objective" in stats and "bound" in stats and stats["objective"]:
+        stats["gap"] = (stats["objective"] - stats["bound"]) / abs(stats["objective"])
+    return stats
+
+
+def model_size(model):
+    # Size of the LpProblem and the big-M coefficients of the formulation
+    prob = model.prob
+    variables = prob.variables()
+    size = {
+        "variables": len(variables),
+        "integer_variables": sum(1 for variable in variables if variable.cat == LpInteger),
+        "constraints": len(prob.constraints),
+        "nonzeros": sum(len(constraint) for constraint in prob.constraints.values()),
+        "big_m_count": 0,
+        "big_m_min": None,
+        "big_m_max": None,
+        "big_m_mean": None,
+    }
+    if model.big_m is not None and len(model.big_m) > 0:
+        big_m = np.asarray(model.big_m)
+        size.update(big_m_count=int(big_m.size), big_m_min=int(big_m.min()), big_m_max=int(big_m.max()), big_m_mean=float(big_m.mean()))
+    return size
+
+
+def solve_with_metrics(model, solver):
+    # Solve the model and measure where the time goes. solver_time is the time the solver itself
+    # reports, io_time the rest of the solve: writing the MPS file, starting CBC and reading the
+    # solution back, or passing the matrix to HiGHS.
+    log_path = None
+    if isinstance(solver, COIN_CMD) and not solver.optionsDict.get("logPath"):
+        log_file, log_path = tempfile.mkstemp(suffix=".log")
+        os.close(log_file)
+        solver.optionsDict["logPath"] = log_path
+    try:
+        with warnings.catch_warnings():
+            # CBC warns that the log file replaces its messages
+            warnings.simplefilter("ignore")
+            result = model.solve(solver)
+    finally:
+        if log_path is not None:
+            del solver.optionsDict["logPath"]
+
+    stats = dict(getattr(solver, "stats", {}))
+    if log_path is not None:
+        if os.path.getsize(log_path) > 0:
+            stats = parse_cbc_log(log_path)
+        os.remove(log_path)
+    elif hasattr(solver, "solution_time"):
+        stats["solver_time"] = solver.solution_time
+
+    record = {
+        "formulation": model.name,
+        "solver": solver.name,
+        "tasks": len(model.tasks),
+        "processors": len(model.processors),
+        "processor_names": list(model.processors),
+        "status": result["status"],
+        "makespan": result["makespan"],
+        "build_time": model.build_time,
+        "wall_time": result["wall_time"],
+        "solver_time": stats.get("solver_time"),
+        "io_time": None,
+        "nodes": stats.get("nodes"),
+        "root_bound": stats.get("root_bound"),
+        "bound": stats.get("bound"),
+        "gap": stats.get("gap"),
+    }
+    if record["solver_time"] is not None:
+        record["io_time"] = max(0.0, result["wall_time"] - record["solver_time"])
+    record.update(model_size(model))
+    return result, record
+
+
+class MetricsLog:
+    # Writes one JSON line per solve to a file ("-" for stdout). The file is opened for every record,
+    # so the log can be handed to the sweep workers and they all append to it.
+    def __init__(self, path="-"):
+        self.path = path
+
+    def emit(self, record):
+        line = json.dumps(dict(record, time=time.time())) + "\n"
+        if self.path == "-":
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        else:
+            with open(self.path, "a") as f:
+                f.write(line)
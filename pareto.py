@@ -0,0 +1,103 @@
+import itertools
+
+from pulp import PULP_CBC_CMD
+
+from bounds import makespan_lower_bound
+from dag import DagIndex
+from formulations import build_model
+from heuristic import list_schedule
+from incremental import IncrementalModel
+from scheduler import default_instance, solve_instance
+
+# Cost/makespan front of the processor configurations. The configurations are visited from cheap
+# to expensive, so a configuration is only on the front if its makespan is below the makespan of
+# every cheaper one. Each configuration is therefore solved with the horizon just below the best
+# makespan so far (an epsilon-constraint), and skipped without solving when a lower bound shows
+# it cannot get there.
+
+
+def system_cost(counts, costs):
+    return sum(count * costs[processor_type] for processor_type, count in counts.items())
+
+
+def non_dominated(points):
+    # The (cost, makespan, ...) points that no other point beats on both, cheapest first
+    front = []
+    for point in sorted(points, key=lambda point: (point[0], point[1])):
+        if point[1] is not None and (not front or point[1] < front[-1][1]):
+            front.append(point)
+    return front
+
+
+def pareto_front(max_counts, max_duration, costs, instance=None, store=None, experiment=None, cache=None, solver=None, warm_start=True, metrics=None,
+                 time_limit=None, gap=None, **options):
+    # Returns the results of the non-dominated configurations, cheapest first, and the number of MILPs solved.
+    # A configuration whose start schedule reaches its lower bound needs no MILP at all. time_limit and
+    # gap apply to every solve, a configuration stopped early can then be missing from the front.
+    instance = instance or default_instance
+    dag = DagIndex(instance.predecessors)
+    model = IncrementalModel(instance, max_counts, max_duration, **options)
+    processor_types = list(max_counts)
+    configs = [dict(zip(processor_types, numbers)) for numbers in itertools.product(*[range(max_counts[t] + 1) for t in processor_types])]
+    configs = [counts for counts in configs if sum(counts.values()) > 0]
+    configs.sort(key=lambda counts: (system_cost(counts, costs), sum(counts.values())))
+    # No configuration can do better than all processor types together
+    best_possible = makespan_lower_bound(instance, max_counts, dag)
+
+    front = []
+    best = max_duration + 1
+    solved = 0
+    for counts in configs:
+        if best <= best_possible:
+            break
+        lower_bound = makespan_lower_bound(instance, counts, dag, lp=True)
+        if lower_bound >= best:
+            continue
+        result = solve_instance(instance, counts, best - 1, store, experiment, cache, model=model, solver=solver, warm_start=warm_start, lower_bound=lower_bound, metrics=metrics,
+                                time_limit=time_limit, gap=gap)
+        if result["formulation"] == "disjunctive":
+            solved += 1
+        # Infeasible means no schedule below the best makespan, so the configuration is dominated
+        if result["makespan"] is not None and result["makespan"] < best:
+            best = int(result["makespan"])
+            front.append(dict(result, cost=system_cost(counts, costs)))
+    return front, solved
+
+
+def cost_front(max_counts, max_duration, costs, instance=None, solver=None, warm_start=True, **options):
+    # The same front from one cost model over the pool of max_counts processors, so the model picks
+    # the processors. Every solve finds the cheapest configuration with a makespan below the last
+    # one, and the shortest makespan for that cost, so it takes one solve (of two MILPs) per point of
+    # the front and at most one to prove there is none left. Returns the results, cheapest first, and
+    # the number of solves.
+    instance = instance or default_instance
+    dag = DagIndex(instance.predecessors)
+    max_counts = {processor_type: max_counts.get(processor_type, 0) for processor_type in instance.processor_types}
+    processors, time_costs_per_processor = instance.processors(max_counts)
+    model = build_model("cost", instance.tasks, instance.predecessors, processors, time_costs_per_processor, max_duration,
+                        processor_costs=instance.processor_costs(max_counts, costs), objective="cost", **options)
+    solver = solver or PULP_CBC_CMD(msg=False)
+    configs = [dict(zip(max_counts, numbers)) for numbers in itertools.product(*[range(count + 1) for count in max_counts.values()])]
+    configs = [counts for counts in configs if sum(counts.values()) > 0]
+    # The processors of a configuration are the first of their type in the pool, so its list
+    # schedule is also a schedule of the cost model. The cheapest one that fits is the start schedule.
+    initials = [list_schedule(instance.tasks, instance.predecessors, *instance.processors(counts)) for counts in configs] if warm_start else []
+    # No configuration can do better than the whole pool
+    best_possible = makespan_lower_bound(instance, max_counts, dag, lp=True)
+    model.set_lower_bound(best_possible)
+
+    front = []
+    solved = 0
+    bound = max_duration
+    while bound >= best_possible:
+        model.set_horizon(bound)
+        candidates = [(system_cost(counts, costs), initial["makespan"], i) for i, (counts, initial) in enumerate(zip(configs, initials)) if initial["makespan"] <= bound]
+        solver.optionsDict["warmStart"] = bool(candidates) and model.set_initial(initials[min(candidates)[2]])
+        result = model.solve(solver)
+        solved += 1
+        if result["makespan"] is None:
+            break
+        counts = instance.count_processors(max_counts, result["used"])
+        front.append(dict(result, counts=counts, pool=max_counts, instance=instance.name))
+        bound = result["makespan"] - 1
+    return front, solved
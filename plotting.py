@@ -0,0 +1,87 @@
+from concurrent.futures import ProcessPoolExecutor
+
+# Figures are created without pyplot, so there is no GUI backend and no global figure registry
+# keeping them alive: a figure is freed as soon as it is saved
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def plot_schedule(schedule, filename):
+    processors = schedule.processors
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.set_xlim(0, schedule.makespan)
+    ax.set_ylim(-1, len(processors) + 0.25)
+    ax.set_yticks(range(len(processors)))
+    ax.set_yticklabels(processors)
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Processor")
+    ax.set_title("Schedule")
+    ax.grid(axis='x')
+    ax.set_axisbelow(True)
+
+    durations = schedule.finish - schedule.start
+    # One bar per task, all drawn in a single call
+    ax.barh(schedule.processor, durations, left=schedule.start, color=["C%d" % (j % 10) for j in range(len(schedule))], edgecolor="black")
+    for j, task in enumerate(schedule.tasks):
+        ax.annotate(
+            task,
+            (schedule.start[j] + durations[j]/2, schedule.processor[j]),
+            color="white",
+            weight="bold",
+            fontsize=10,
+            ha="center",
+            va="center"
+        )
+
+    fig.savefig(filename, dpi=300, bbox_inches="tight")
+    return filename
+
+
+def plot_front(system_costs, makespans, front, filename):
+    # Cost against execution time of every configuration, with the (cost, makespan) points of the
+    # Pareto front connected and circled. Configurations without a schedule are left out.
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.set_xlabel("Costs ($)")
+    ax.set_ylabel("Execution Time (s)")
+    ax.grid()
+    ax.set_axisbelow(True)
+
+    points = [(cost, makespan / 1000) for cost, makespan in zip(system_costs, makespans) if makespan is not None]
+    system_costs = [point[0] for point in points]
+    makespans = [point[1] for point in points]
+    z = [makespan * cost for makespan, cost in zip(makespans, system_costs)]
+    p = ax.scatter(system_costs, makespans, c=z, cmap="plasma", s=100)
+    fig.colorbar(p, ax=ax)
+    if front:
+        front_costs = [point[0] for point in front]
+        front_makespans = [point[1] / 1000 for point in front]
+        ax.step(front_costs, front_makespans, where="post", color="black", zorder=0)
+        ax.scatter(front_costs, front_makespans, s=200, facecolors="none", edgecolors="black", label="Pareto front")
+        ax.legend()
+    fig.savefig(filename, dpi=300, bbox_inches="tight")
+    return filename
+
+
+def render_job(job):
+    return plot_schedule(*job)
+
+
+def start_rendering(jobs, processes=None):
+    # Render the (schedule, filename) jobs in background processes,
+    # returns the futures of the written file names
+    executor = ProcessPoolExecutor(processes)
+    futures = [executor.submit(render_job, job) for job in jobs]
+    executor.shutdown(wait=False)
+    return futures
+
+
+def render_schedules(jobs, processes=None):
+    # Render a batch of jobs, in this process if processes is 0
+    if processes == 0:
+        return [render_job(job) for job in jobs]
+    futures = start_rendering(jobs, processes)
+    return [future.result() for future in futures]
@@ -0,0 +1,94 @@
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+
+from scheduler import solve_instance
+from solvers import make_solver
+
+# Solve configurations that do well on different instances. Every configuration holds the
+# solve_schedule options, "solver" is the name for solvers.make_solver and "seed" its random seed.
+DEFAULT_PORTFOLIO = {
+    "cbc": {"solver": "cbc", "warm_start": True},
+    "cbc+SB": {"solver": "cbc", "warm_start": True, "symmetry_breaking": "index", "big_m": "tight"},
+    "highs": {"solver": "highs", "warm_start": True},
+    "highs+SB": {"solver": "highs", "warm_start": True, "symmetry_breaking": "first-task", "seed": 1},
+    "benders": {"solver": "cbc", "formulation": "benders", "subproblem_time_limit": 10},
+}
+
+# Time after the deadline for the workers to report the best schedule they found
+GRACE_TIME = 5
+
+
+def solve_configuration(name, instance, counts, max_duration, configuration, time_limit, results):
+    # A process group of its own, so cancelling the worker also stops the CBC process it started
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    options = dict(configuration)
+    solver = make_solver(options.pop("solver", "cbc"), seed=options.pop("seed", None))
+    if options.get("formulation") == "heft":
+        solver = None
+    try:
+        result = solve_instance(instance, counts, max_duration, solver=solver, time_limit=time_limit, **options)
+        results.put((name, result))
+    except Exception as error:
+        results.put((name, error))
+
+
+def cancel(process):
+    if process.is_alive():
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        else:
+            process.terminate()
+    process.join()
+
+
+def solve_portfolio(instance, counts, max_duration, portfolio=None, time_limit=None, processes=None):
+    # Solves the instance with every configuration of the portfolio in its own process, at most
+    # processes at the same time. Returns the first proven optimum and cancels the other solves,
+    # or else the best schedule once all have finished or the time limit is over.
+    # result["configuration"] is the name of the configuration that found it.
+    portfolio = DEFAULT_PORTFOLIO if portfolio is None else portfolio
+    processes = min(len(portfolio), processes or os.cpu_count() or 1)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    results = mp.Queue()
+    waiting = list(portfolio.items())
+    running = {}
+    best = None
+    errors = []
+    try:
+        while waiting or running:
+            while waiting and len(running) < processes:
+                name, configuration = waiting.pop(0)
+                # Configurations started later get what is left of the time limit
+                remaining = None if deadline is None else max(1, deadline - time.perf_counter())
+                process = mp.Process(target=solve_configuration, args=(name, instance, counts, max_duration, configuration, remaining, results), daemon=True)
+                process.start()
+                running[name] = process
+            timeout = None if deadline is None else deadline + GRACE_TIME - time.perf_counter()
+            try:
+                name, result = results.get(timeout=None if timeout is None else max(0, timeout))
+            except queue.Empty:
+                break
+            running.pop(name).join()
+            if isinstance(result, Exception):
+                errors.append(result)
+                continue
+            result["configuration"] = name
+            if result["makespan"] is not None and (best is None or result["makespan"] < best["makespan"]):
+                best = result
+            # A proven optimum, or proof that there is no schedule within max_duration
+            if (result.get("proven") or result["status"] == "Infeasible") and result["exact"]:
+                best = result
+                break
+    finally:
+        for process in running.values():
+            cancel(process)
+    if best is None and errors:
+        raise errors[0]
+    return best
@@ -0,0 +1,112 @@
+import glob as gl
+import json
+import os
+import re
+import sqlite3
+import time
+
+# Every solve is stored as one row, the start times and the assignment are kept as JSON
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    experiment TEXT,
+    n_a INTEGER NOT NULL,
+    n_b INTEGER NOT NULL,
+    makespan REAL,
+    start_times TEXT,
+    assignment TEXT,
+    status TEXT,
+    wall_time REAL,
+    created REAL,
+    instance TEXT,
+    counts TEXT
+);
+CREATE INDEX IF NOT EXISTS results_config ON results (experiment, n_a, n_b);
+"""
+# Columns added after the first version of the table, added to existing stores on open
+ADDED_COLUMNS = {"instance": "TEXT", "counts": "TEXT"}
+
+
+class ResultStore:
+    def __init__(self, path="results.db"):
+        self.path = path
+        # A timeout so the sweep workers can write to the same file concurrently
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(results)")]
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in columns:
+                self.connection.execute("ALTER TABLE results ADD COLUMN %s %s" % (column, column_type))
+
+    def close(self):
+        self.connection.close()
+
+    def add(self, result):
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO results (experiment, n_a, n_b, makespan, start_times, assignment, status, wall_time, created, instance, counts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    result.get("experiment"),
+                    result["n_a"],
+                    result["n_b"],
+                    result.get("makespan"),
+                    json.dumps(result.get("start_times")),
+                    json.dumps(result.get("assignment")),
+                    result.get("status"),
+                    result.get("wall_time"),
+                    time.time(),
+                    result.get("instance"),
+                    json.dumps(result.get("counts", {"A": result["n_a"], "B": result["n_b"]})),
+                ),
+            )
+
+    def rows(self, experiment=None, status=None):
+        query = "SELECT * FROM results WHERE 1 = 1"
+        args = []
+        if experiment is not None:
+            query += " AND experiment = ?"
+            args.append(experiment)
+        if status is not None:
+            query += " AND status = ?"
+            args.append(status)
+        results = []
+        for row in self.connection.execute(query + " ORDER BY n_a, n_b, id", args):
+            result = dict(row)
+            result["start_times"] = json.loads(result["start_times"])
+            result["assignment"] = json.loads(result["assignment"])
+            result["counts"] = json.loads(result["counts"]) if result["counts"] else {"A": result["n_a"], "B": result["n_b"]}
+            results.append(result)
+        return results
+
+    def best_makespans(self, experiment=None, instance=None):
+        # Shortest optimal makespan found for each (n_a, n_b) configuration. Rows stored before the
+        # instance column existed have none, they are all of the assignment instance.
+        query = "SELECT n_a, n_b, MIN(makespan) FROM results WHERE status = 'Optimal'"
+        args = []
+        if experiment is not None:
+            query += " AND experiment = ?"
+            args.append(experiment)
+        if instance is not None:
+            query += " AND (instance = ? OR instance IS NULL)"
+            args.append(instance)
+        query += " GROUP BY n_a, n_b ORDER BY n_a, n_b"
+        return {(n_a, n_b): makespan for n_a, n_b, makespan in self.connection.execute(query, args)}
+
+    def import_png_results(self, result_path, experiment):
+        # Backfill the store from the old na%d-nb%d-schedule-ms%d.png result files
+        count = 0
+        for result in gl.glob(os.path.join(result_path, "na*-nb*-schedule-ms*.png")):
+            match = re.findall(r"na(\d+)-nb(\d+)-schedule-ms(\d+).png", os.path.basename(result))
+            if not match:
+                continue
+            self.add({
+                "experiment": experiment,
+                "n_a": int(match[0][0]),
+                "n_b": int(match[0][1]),
+                "makespan": int(match[0][2]),
+                "status": "Optimal",
+            })
+            count += 1
+        return count
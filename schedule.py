@@ -0,0 +1,90 @@
+import numpy as np
+
+
+class Schedule:
+    # A solved schedule as arrays indexed by task: the processor index it runs on and its start and
+    # finish time. Built once from the solution, so nothing has to read the PuLP variables afterwards.
+    __slots__ = ("tasks", "processors", "processor", "start", "finish", "makespan", "task_index", "processor_index")
+
+    def __init__(self, tasks, processors, processor, start, durations):
+        # processor[j] is the index in processors of the processor of task j, durations[j] its execution time there
+        self.tasks = list(tasks)
+        self.processors = list(processors)
+        self.processor = np.asarray(processor, dtype=np.int64)
+        self.start = np.rint(np.asarray(start, dtype=np.float64)).astype(np.int64)
+        self.finish = self.start + np.asarray(durations, dtype=np.int64)
+        self.makespan = int(self.finish.max()) if len(self.tasks) else 0
+        self.task_index = {task: j for j, task in enumerate(self.tasks)}
+        self.processor_index = {processor: a for a, processor in enumerate(self.processors)}
+
+    @classmethod
+    def from_arrays(cls, tasks, processors, time_costs_per_processor, processor, start):
+        processor = np.asarray(processor, dtype=np.int64)
+        costs = np.asarray(time_costs_per_processor, dtype=np.int64)
+        return cls(tasks, processors, processor, start, costs[processor, np.arange(len(tasks))])
+
+    @classmethod
+    def from_result(cls, result, tasks, processors, time_costs_per_processor):
+        # From the start_times and assignment dicts of a result, e.g. one read from the cache
+        processor_index = {processor: a for a, processor in enumerate(processors)}
+        processor = [processor_index[result["assignment"][task]] for task in tasks]
+        start = [result["start_times"][task] for task in tasks]
+        return cls.from_arrays(tasks, processors, time_costs_per_processor, processor, start)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def start_of(self, task):
+        return int(self.start[self.task_index[task]])
+
+    def finish_of(self, task):
+        return int(self.finish[self.task_index[task]])
+
+    def duration_of(self, task):
+        j = self.task_index[task]
+        return int(self.finish[j] - self.start[j])
+
+    def processor_of(self, task):
+        return self.processors[self.processor[self.task_index[task]]]
+
+    def tasks_on(self, processor):
+        # Tasks of a processor in order of their start times
+        on = np.flatnonzero(self.processor == self.processor_index[processor])
+        return [self.tasks[j] for j in on[np.argsort(self.start[on], kind="stable")]]
+
+    def start_times(self):
+        return {task: int(self.start[j]) for j, task in enumerate(self.tasks)}
+
+    def assignment(self):
+        return {task: self.processors[a] for task, a in zip(self.tasks, self.processor)}
+
+    def validate(self, predecessors):
+        # Everything wrong with the schedule, an empty list if it is feasible
+        errors = []
+        for j in np.flatnonzero(self.start < 0):
+            errors.append("%s starts before 0" % self.tasks[j])
+        for j, preds in enumerate(predecessors):
+            for i in preds:
+                if self.start[j] < self.finish[i]:
+                    errors.append("%s starts at %d before its predecessor %s finishes at %d" % (self.tasks[j], self.start[j], self.tasks[i], self.finish[i]))
+        for a, processor in enumerate(self.processors):
+            on = np.flatnonzero(self.processor == a)
+            on = on[np.argsort(self.start[on], kind="stable")]
+            for i, j in zip(on[:-1], on[1:]):
+                if self.start[j] < self.finish[i]:
+                    errors.append("%s and %s overlap on %s" % (self.tasks[i], self.tasks[j], processor))
+        return errors
+
+    def to_dict(self):
+        return {
+            "tasks": self.tasks,
+            "processors": self.processors,
+            "processor": self.processor.tolist(),
+            "start": self.start.tolist(),
+            "finish": self.finish.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        start = np.asarray(data["start"], dtype=np.int64)
+        return cls(data["tasks"], data["processors"], data["processor"], start, np.asarray(data["finish"], dtype=np.int64) - start)
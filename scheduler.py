@@ -0,0 +1,227 @@
+import queue
+import threading
+
+from heuristic import list_schedule
+from instance import Instance
+from local_search import local_search
+from schedule import Schedule
+
+# PuLP, the models and the solver backends are imported by the functions that solve a MILP, the
+# heuristics and the results need none of them
+
+
+# The 12-task instance of the assignment
+tasks = ["T"+str(i) for i in range(1,13)]
+time_costs = [
+    [821, 334, 754, 679, 805, 441, 577, 239, 320, 487, 345, 399],
+    [576, 297, 567, 362, 339, 267, 409, 197, 239, 765, 498, 274]
+]
+# Immediate predecessor of each task
+predecesssors = [0, 1, 2, 1, 4, 5, 4, 7, 8, 7, 10, 11, 12]
+# predecesssors uses 1-based indices and 0 for none
+default_instance = Instance(tasks, ["A", "B"], time_costs, [[p - 1] if p else [] for p in predecesssors[:len(tasks)]], name="part4")
+
+
+def make_processors(n_a, n_b, instance=None):
+    return (instance or default_instance).processors({"A": n_a, "B": n_b})
+
+
+def get_schedule(n_a, n_b, max_duration, store=None, experiment=None, cache=None, instance=None, **options):
+    return solve_instance(instance or default_instance, {"A": n_a, "B": n_b}, max_duration, store, experiment, cache, **options)
+
+
+def solve_instance(instance, counts, max_duration, store=None, experiment=None, cache=None, model=None, **options):
+    # Schedule an instance on counts[type] processors of every processor type. With an
+    # incremental.IncrementalModel of the instance, that model is re-solved instead of building a new one.
+    # With formulation="cost" and costs, the price per processor type, counts is the pool the model
+    # picks its processors from, result["counts"] are the processors it uses and result["pool"] the pool.
+    processors, time_costs_per_processor = instance.processors(counts)
+    pool = None
+    if options.get("formulation") == "cost":
+        if "costs" not in options:
+            raise ValueError("The cost formulation needs the costs per processor type")
+        options["processor_costs"] = instance.processor_costs(counts, options.pop("costs"))
+        pool = {processor_type: counts.get(processor_type, 0) for processor_type in instance.processor_types}
+        # The cached optimum of the pool is that of its makespan alone
+        cache = None
+
+    result = None
+    if cache is not None:
+        result = cache.get(processors, time_costs_per_processor, instance.predecessors)
+        # A cached optimum above the requested bound would have been infeasible
+        if result is not None and result["makespan"] > max_duration:
+            result = None
+    if result is None:
+        if model is not None:
+            result = model.solve(counts, max_duration, **options)
+        else:
+            result = solve_schedule(processors, time_costs_per_processor, max_duration, instance=instance, **options)
+        # The cache key leaves out the options, so only an optimum that holds whatever they were is
+        # stored: proven, and not from a solve that was allowed to stop at a gap or time limit
+        if cache is not None and result.get("proven") and result["exact"] and options.get("gap") is None and options.get("time_limit") is None:
+            cache.put(processors, time_costs_per_processor, instance.predecessors, result)
+
+    counts = {processor_type: counts.get(processor_type, 0) for processor_type in instance.processor_types}
+    if pool is not None:
+        counts = instance.count_processors(pool, result.get("used", []))
+    result = dict(result, counts=counts, n_a=counts.get("A", 0), n_b=counts.get("B", 0), instance=instance.name)
+    if pool is not None:
+        result["pool"] = pool
+    # Cached results have no Schedule, and one of an incremental model also lists its unused processors
+    schedule = result.get("schedule")
+    if result["makespan"] is not None and (schedule is None or schedule.processors != processors):
+        result["schedule"] = Schedule.from_result(result, instance.tasks, processors, time_costs_per_processor)
+    if store is not None:
+        store.add(dict(result, experiment=experiment))
+    return result
+
+
+def plot_job(result, instance=None):
+    # Everything plotting.plot_schedule needs to draw the Gantt chart of a solve_instance result
+    schedule = result.get("schedule")
+    if schedule is None:
+        instance = instance or default_instance
+        processors, time_costs_per_processor = instance.processors(result["counts"])
+        schedule = Schedule.from_result(result, instance.tasks, processors, time_costs_per_processor)
+    filename = "-".join("n%s%d" % (processor_type.lower(), count) for processor_type, count in result["counts"].items())
+    filename += "-schedule-ms%d.png" % schedule.makespan
+    return schedule, filename
+
+
+def solve_schedule(processors, time_costs_per_processor, max_duration, formulation="disjunctive", solver=None, warm_start=False, instance=None, time_limit=None, gap=None, metrics=None, lower_bound=None, **options):
+    # time_limit (seconds) and gap (relative) stop the solver early with the best schedule found so far.
+    # A lower bound on the makespan (bounds.makespan_lower_bound) stops it as soon as a schedule reaches it.
+    # With a metrics.MetricsLog every solve emits a record of its model size, timings and search statistics.
+    instance = instance or default_instance
+    # Without processors there is no schedule, and no model to build
+    if not processors:
+        return dict(list_schedule(instance.tasks, instance.predecessors, processors, time_costs_per_processor), formulation=formulation)
+    # The list scheduling heuristic on its own gives a schedule without an optimality guarantee
+    if formulation == "heft":
+        return list_schedule(instance.tasks, instance.predecessors, processors, time_costs_per_processor)
+    # Tabu search from the list schedule, for a better schedule within milliseconds. Without a time limit it searches for 0.1 s.
+    if formulation == "tabu":
+        return local_search(instance.tasks, instance.predecessors, processors, time_costs_per_processor,
+                            time_limit=0.1 if time_limit is None else time_limit, **options)
+    # Assignment master and sequencing subproblems, for DAGs too large for a single model. It starts
+    # from the list schedule itself, so warm_start makes no difference.
+    if formulation == "benders":
+        from decomposition import solve_decomposition
+        return solve_decomposition(instance.tasks, instance.predecessors, processors, time_costs_per_processor, max_duration,
+                                   solver=solver, time_limit=time_limit, gap=gap, metrics=metrics, **options)
+
+    from pulp import PULP_CBC_CMD
+
+    from formulations import build_model
+    from metrics import solve_with_metrics
+    from solvers import make_solver
+
+    initial = None
+    if warm_start:
+        # The heuristic schedule is feasible, so its makespan is an upper bound on the optimum
+        initial = list_schedule(instance.tasks, instance.predecessors, processors, time_costs_per_processor)
+        if initial["makespan"] is None or initial["makespan"] > max_duration:
+            initial = None
+        # A schedule on fewer processors can be slower and still be better for the cost model
+        elif formulation != "cost":
+            max_duration = initial["makespan"]
+    # A start schedule that reaches the lower bound is optimal, there is nothing left to solve
+    if initial is not None and lower_bound is not None and initial["makespan"] <= lower_bound and formulation != "cost":
+        return dict(initial, status="Optimal", exact=True, proven=True)
+
+    model = build_model(formulation, instance.tasks, instance.predecessors, processors, time_costs_per_processor, max_duration, **options)
+    if lower_bound is not None:
+        model.set_lower_bound(lower_bound)
+    # The limits and the start schedule are for this solve only, a solver of the caller gets its own settings back
+    settings = None if solver is None else (solver.timeLimit, solver.optionsDict.get("gapRel"), solver.optionsDict.get("warmStart", False))
+    if solver is None and (time_limit is not None or gap is not None):
+        solver = make_solver("cbc")
+    try:
+        if time_limit is not None:
+            solver.timeLimit = time_limit
+        if gap is not None:
+            solver.optionsDict["gapRel"] = gap
+        if initial is not None and model.set_initial(initial):
+            if solver is None:
+                solver = PULP_CBC_CMD()
+            solver.optionsDict["warmStart"] = True
+        if metrics is None:
+            return model.solve(solver)
+        result, record = solve_with_metrics(model, solver or PULP_CBC_CMD())
+        metrics.emit(dict(record, warm_start=initial is not None, **options))
+        return result
+    finally:
+        if settings is not None:
+            solver.timeLimit, solver.optionsDict["gapRel"], solver.optionsDict["warmStart"] = settings
+
+
+def iter_schedules(instance, counts, max_duration, time_limit=None, gap=None, formulation="disjunctive", threads=None, **options):
+    # Anytime solve: yields the list schedule first, then every improved schedule the MILP solver finds
+    # while it runs, each with the best bound and the relative gap, and finally the result of the solve.
+    # Closing the generator stops the solver. Needs highspy, with CBC only the first and last are yielded.
+    processors, time_costs_per_processor = instance.processors(counts)
+    counts = {processor_type: counts.get(processor_type, 0) for processor_type in instance.processor_types}
+    initial = list_schedule(instance.tasks, instance.predecessors, processors, time_costs_per_processor)
+    if initial["makespan"] is None:
+        # No processors, there is nothing to solve
+        yield dict(initial, counts=counts, instance=instance.name, bound=None, gap=None)
+        return
+    best = max_duration + 1
+    if initial["makespan"] <= max_duration:
+        best = initial["makespan"]
+        yield dict(initial, counts=counts, instance=instance.name, bound=None, gap=None)
+        # Only better schedules are of interest
+        max_duration = initial["makespan"]
+
+    from formulations import build_model
+    from solvers import HighsSolver, make_solver
+
+    model = build_model(formulation, instance.tasks, instance.predecessors, processors, time_costs_per_processor, max_duration, **options)
+    incumbents = queue.Queue()
+    stop = threading.Event()
+
+    def on_incumbent(stats):
+        schedule = model.current_schedule()
+        if schedule is None:
+            return
+        incumbents.put({
+            "makespan": schedule.makespan,
+            "start_times": schedule.start_times(),
+            "assignment": schedule.assignment(),
+            "schedule": schedule,
+            "status": "Incumbent",
+            "bound": stats["bound"],
+            "gap": stats["gap"],
+            "formulation": model.name,
+            "exact": model.exact,
+        })
+
+    solver = HighsSolver(timeLimit=time_limit, gapRel=gap, threads=threads, on_incumbent=on_incumbent, interrupt=stop.is_set)
+    if not solver.available():
+        solver = make_solver("cbc", time_limit=time_limit, gap=gap, threads=threads)
+    if initial["makespan"] <= max_duration and model.set_initial(initial):
+        solver.optionsDict["warmStart"] = True
+
+    def run():
+        try:
+            incumbents.put(dict(model.solve(solver), final=True))
+        except Exception as error:
+            incumbents.put(error)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            result = incumbents.get()
+            if isinstance(result, Exception):
+                raise result
+            if result.pop("final", False):
+                result.update(getattr(solver, "stats", {"bound": None, "gap": None}))
+                yield dict(result, counts=counts, instance=instance.name)
+                return
+            if result["makespan"] is not None and result["makespan"] < best:
+                best = result["makespan"]
+                yield dict(result, counts=counts, instance=instance.name)
+    finally:
+        stop.set()
+        thread.join()
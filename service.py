@@ -0,0 +1,256 @@
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from instance import from_records
+from scheduler import default_instance, iter_schedules, solve_instance
+
+# Scheduling service over a Unix socket or TCP, one JSON object per line in both directions.
+#
+# Request:
+#   {"id": "r1", "instance": {"name": ..., "processor_types": [...], "tasks": [...]}, "counts": {"A": 2, "B": 1},
+#    "max_duration": 7000, "time_limit": 10, "deadline": 30, "options": {"formulation": "disjunctive"}}
+# The instance has the .json layout of instance.py, without it the part 4 instance is used. Only
+# counts is required. time_limit stops the solver, deadline (seconds from now) is when the client
+# wants an answer, queueing included.
+#
+# Responses, for every request in the order the schedules are found:
+#   {"id": "r1", "type": "incumbent", "result": {...}}   the list schedule and improved schedules, if any
+#   {"id": "r1", "type": "result", "result": {...}}      the result of the solve, the last response
+#   {"id": "r1", "type": "deadline", "result": {...}}    the best schedule so far (or null) at the deadline
+#   {"id": "r1", "type": "error", "error": "..."}
+# A result is a result dict of the scheduler without the Schedule object.
+#
+# Identical requests that are queued or solving share one solve. At most queue_size solves wait
+# for a worker, after that the server stops reading requests until a worker is free.
+
+# Formulations that give one result without incumbents along the way
+SINGLE_RESULT = ("heft", "tabu", "benders", "cost")
+
+
+def encode(result):
+    return {key: value for key, value in result.items() if key != "schedule"}
+
+
+def solve_job(instance, counts, max_duration, time_limit, options, updates):
+    # Runs in a worker process, every schedule goes to the updates queue and None marks the end
+    try:
+        if options.get("formulation") in SINGLE_RESULT:
+            updates.put(("result", encode(solve_instance(instance, counts, max_duration, time_limit=time_limit, **options))))
+        else:
+            for result in iter_schedules(instance, counts, max_duration, time_limit=time_limit, **options):
+                final = result["status"] not in ("Heuristic", "Incumbent")
+                updates.put(("result" if final else "incumbent", encode(result)))
+    except Exception as error:
+        updates.put(("error", "%s: %s" % (type(error).__name__, error)))
+    updates.put(None)
+
+
+async def send(writer, message):
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+
+
+class Job:
+    # One solve and the requests waiting for it
+    def __init__(self, key, instance, counts, max_duration, time_limit, options, deadline):
+        self.key = key
+        self.instance = instance
+        self.counts = counts
+        self.max_duration = max_duration
+        self.time_limit = time_limit
+        self.options = options
+        self.deadline = deadline
+        self.subscribers = []
+        self.best = None
+
+    def subscribe(self):
+        subscriber = asyncio.Queue()
+        if self.best is not None:
+            subscriber.put_nowait(("incumbent", self.best))
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def publish(self, kind, payload):
+        if kind in ("incumbent", "result") and payload["makespan"] is not None:
+            self.best = payload
+        for subscriber in self.subscribers:
+            subscriber.put_nowait((kind, payload))
+
+
+class ScheduleService:
+    def __init__(self, workers=None, queue_size=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.jobs = {}
+
+    async def start(self):
+        self.pool = ProcessPoolExecutor(self.workers)
+        self.manager = mp.Manager()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.dispatchers = [asyncio.create_task(self.dispatch()) for worker in range(self.workers)]
+
+    async def close(self):
+        for dispatcher in self.dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        self.pool.shutdown(cancel_futures=True)
+        self.manager.shutdown()
+
+    def parse(self, request):
+        # The job of a request, the key leaves out what does not change the solve
+        instance = default_instance
+        if request.get("instance") is not None:
+            instance = from_records(request["instance"], request["instance"]["tasks"])
+        counts = request["counts"]
+        max_duration = request.get("max_duration") or instance.serial_makespan()
+        options = request.get("options", {})
+        key = json.dumps([request.get("instance"), counts, max_duration, request.get("time_limit"), options], sort_keys=True)
+        deadline = None if request.get("deadline") is None else asyncio.get_running_loop().time() + request["deadline"]
+        return key, instance, counts, max_duration, request.get("time_limit"), options, deadline
+
+    async def submit(self, request):
+        # The job of the request and the queue of its responses. Waits while the queue of solves is full.
+        key, *fields = self.parse(request)
+        job = self.jobs.get(key)
+        if job is None:
+            job = Job(key, *fields)
+            self.jobs[key] = job
+            await self.queue.put(job)
+        elif job.deadline is not None:
+            # The solve serves the request that waits longest
+            job.deadline = None if fields[-1] is None else max(job.deadline, fields[-1])
+        return job, job.subscribe()
+
+    async def dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            time_limit = job.time_limit
+            if job.deadline is not None:
+                remaining = job.deadline - loop.time()
+                if remaining <= 0:
+                    self.jobs.pop(job.key, None)
+                    job.publish("error", "deadline passed before the solve started")
+                    continue
+                time_limit = remaining if time_limit is None else min(time_limit, remaining)
+            updates = self.manager.Queue()
+            pool = self.pool
+            try:
+                future = loop.run_in_executor(pool, solve_job, job.instance, job.counts, job.max_duration, time_limit, job.options, updates)
+                while True:
+                    get = loop.run_in_executor(None, updates.get)
+                    # A worker that dies never sends the trailing None, only its future tells
+                    await asyncio.wait((get, future), return_when=asyncio.FIRST_COMPLETED)
+                    if not get.done() and future.exception() is not None:
+                        # Frees the thread waiting on the queue
+                        updates.put(None)
+                        await get
+                        raise future.exception()
+                    update = await get
+                    if update is None:
+                        break
+                    # A request that comes in after the last response starts a new solve, so the job
+                    # is gone before it is published
+                    if update[0] != "incumbent":
+                        self.jobs.pop(job.key, None)
+                    job.publish(*update)
+                await future
+            except Exception as error:
+                self.jobs.pop(job.key, None)
+                job.publish("error", "%s: %s" % (type(error).__name__, error))
+                if isinstance(error, BrokenProcessPool) and pool is self.pool:
+                    # A dead worker breaks the whole pool, the next solves get a new one
+                    pool.shutdown(wait=False)
+                    self.pool = ProcessPoolExecutor(self.workers)
+            finally:
+                self.jobs.pop(job.key, None)
+
+    async def respond(self, request, writer, job, responses, deadline):
+        loop = asyncio.get_running_loop()
+        best = None
+        try:
+            while True:
+                try:
+                    timeout = None if deadline is None else max(0, deadline - loop.time())
+                    kind, payload = await asyncio.wait_for(responses.get(), timeout)
+                except asyncio.TimeoutError:
+                    kind, payload = "deadline", best
+                if kind in ("incumbent", "result") and payload["makespan"] is not None:
+                    best = payload
+                await send(writer, {"id": request.get("id"), "type": kind, "error" if kind == "error" else "result": payload})
+                if kind != "incumbent":
+                    return
+        finally:
+            job.subscribers.remove(responses)
+
+    async def handle(self, reader, writer):
+        # Requests of one connection are served concurrently, their responses are interleaved
+        loop = asyncio.get_running_loop()
+        pending = set()
+        async for line in reader:
+            if not line.strip():
+                continue
+            request = {}
+            try:
+                request = json.loads(line)
+                job, responses = await self.submit(request)
+            except Exception as error:
+                await send(writer, {"id": request.get("id"), "type": "error", "error": "%s: %s" % (type(error).__name__, error)})
+                continue
+            deadline = None if request.get("deadline") is None else loop.time() + request["deadline"]
+            pending.add(asyncio.create_task(self.respond(request, writer, job, responses, deadline)))
+        await asyncio.gather(*pending, return_exceptions=True)
+        writer.close()
+
+
+async def serve(path=None, host="127.0.0.1", port=8765, workers=None, queue_size=64):
+    # Listens on the Unix socket path, or on host:port without one
+    service = ScheduleService(workers, queue_size)
+    await service.start()
+    try:
+        if path is not None:
+            server = await asyncio.start_unix_server(service.handle, path)
+        else:
+            server = await asyncio.start_server(service.handle, host, port)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+async def request_schedules(requests, path=None, host="127.0.0.1", port=8765):
+    # Client: sends the requests over one connection and yields the responses as they arrive
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    waiting = set()
+    for request in requests:
+        await send(writer, request)
+        waiting.add(request.get("id"))
+    while waiting:
+        line = await reader.readline()
+        if not line:
+            break
+        response = json.loads(line)
+        if response["type"] != "incumbent":
+            waiting.discard(response["id"])
+        yield response
+    writer.close()
+    await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve schedules over a socket, one JSON request per line")
+    parser.add_argument("--socket", help="Unix socket path, TCP without it")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="solver processes, one per CPU by default")
+    parser.add_argument("--queue-size", type=int, default=64, help="solves waiting for a worker before requests are no longer read")
+    args = parser.parse_args()
+    asyncio.run(serve(args.socket, args.host, args.port, args.workers, args.queue_size))
@@ -0,0 +1,158 @@
+import time
+
+import numpy as np
+from pulp import PULP_CBC_CMD, LpSolver, PulpSolverError, constants
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+
+# HiGHS model status -> PuLP status and solution status. As with CBC, a solve that stops at a limit
+# with a schedule reports "Optimal" with an integer feasible solution.
+HIGHS_STATUS = {
+    "kOptimal": (constants.LpStatusOptimal, constants.LpSolutionOptimal),
+    "kInfeasible": (constants.LpStatusInfeasible, constants.LpSolutionInfeasible),
+    "kUnboundedOrInfeasible": (constants.LpStatusInfeasible, constants.LpSolutionInfeasible),
+    "kUnbounded": (constants.LpStatusUnbounded, constants.LpSolutionUnbounded),
+    "kTimeLimit": (constants.LpStatusOptimal, constants.LpSolutionIntegerFeasible),
+    "kIterationLimit": (constants.LpStatusOptimal, constants.LpSolutionIntegerFeasible),
+    "kSolutionLimit": (constants.LpStatusOptimal, constants.LpSolutionIntegerFeasible),
+    "kInterrupt": (constants.LpStatusOptimal, constants.LpSolutionIntegerFeasible),
+    "kObjectiveBound": (constants.LpStatusOptimal, constants.LpSolutionIntegerFeasible),
+    "kObjectiveTarget": (constants.LpStatusOptimal, constants.LpSolutionIntegerFeasible),
+}
+
+
+class HighsSolver(LpSolver):
+    # Solves an LpProblem with HiGHS in this process: the model is passed to HiGHS as arrays in one
+    # call and the solution is read back from memory, no files and no subprocess.
+    # Accepts the PuLP solver arguments msg, timeLimit, gapRel, threads and warmStart, and the random seed of HiGHS.
+    # on_incumbent(stats) is called from the solve with the variables set to every improved
+    # integer solution, stats holds its objective, the dual bound and the gap. The solve stops
+    # early once interrupt() returns True.
+    name = "HiGHS"
+
+    def __init__(self, mip=True, msg=False, timeLimit=None, gapRel=None, threads=None, seed=None, on_incumbent=None, interrupt=None, **options):
+        # gapRel is kept in optionsDict as PULP_CBC_CMD does, so it can be changed the same way on both
+        super().__init__(mip=mip, msg=msg, timeLimit=timeLimit, gapRel=gapRel, **options)
+        self.threads = threads
+        self.seed = seed
+        self.on_incumbent = on_incumbent
+        self.interrupt = interrupt
+        # Node count, dual bound, gap and dual bound after the root node of the last solve
+        self.stats = {}
+
+    def available(self):
+        return highspy is not None
+
+    def actualSolve(self, lp, **kwargs):
+        if not self.available():
+            raise PulpSolverError("HiGHS: highspy is not installed")
+        variables = lp.variables()
+        column = {variable.name: i for i, variable in enumerate(variables)}
+
+        model = highspy.HighsLp()
+        model.num_col_ = len(variables)
+        model.num_row_ = len(lp.constraints)
+        sign = -1 if lp.sense == constants.LpMaximize else 1
+        model.col_cost_ = np.array([sign * lp.objective.get(variable, 0) for variable in variables], dtype=np.float64)
+        model.col_lower_ = np.array([-highspy.kHighsInf if v.lowBound is None else v.lowBound for v in variables], dtype=np.float64)
+        model.col_upper_ = np.array([highspy.kHighsInf if v.upBound is None else v.upBound for v in variables], dtype=np.float64)
+        if self.mip:
+            model.integrality_ = [highspy.HighsVarType.kInteger if v.cat == constants.LpInteger else highspy.HighsVarType.kContinuous for v in variables]
+
+        # Constraint matrix row by row
+        starts = [0]
+        indices = []
+        values = []
+        row_lower = []
+        row_upper = []
+        for constraint in lp.constraints.values():
+            for variable, coefficient in constraint.items():
+                indices.append(column[variable.name])
+                values.append(coefficient)
+            starts.append(len(indices))
+            rhs = -constraint.constant
+            row_lower.append(rhs if constraint.sense in (constants.LpConstraintGE, constants.LpConstraintEQ) else -highspy.kHighsInf)
+            row_upper.append(rhs if constraint.sense in (constants.LpConstraintLE, constants.LpConstraintEQ) else highspy.kHighsInf)
+        model.row_lower_ = np.array(row_lower, dtype=np.float64)
+        model.row_upper_ = np.array(row_upper, dtype=np.float64)
+        model.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        model.a_matrix_.start_ = np.array(starts, dtype=np.int32)
+        model.a_matrix_.index_ = np.array(indices, dtype=np.int32)
+        model.a_matrix_.value_ = np.array(values, dtype=np.float64)
+
+        highs = highspy.Highs()
+        highs.setOptionValue("output_flag", bool(self.msg))
+        if self.timeLimit is not None:
+            highs.setOptionValue("time_limit", float(self.timeLimit))
+        if self.optionsDict.get("gapRel") is not None:
+            highs.setOptionValue("mip_rel_gap", float(self.optionsDict["gapRel"]))
+        if self.threads is not None:
+            highs.setOptionValue("threads", int(self.threads))
+        if self.seed is not None:
+            highs.setOptionValue("random_seed", int(self.seed))
+        highs.passModel(model)
+        if self.optionsDict.get("warmStart") and all(v.varValue is not None for v in variables):
+            # The current values of the variables, as set by ScheduleModel.set_initial
+            solution = highspy.HighsSolution()
+            solution.col_value = [v.varValue for v in variables]
+            highs.setSolution(solution)
+
+        if self.on_incumbent is not None:
+            def improved(event):
+                for variable, x in zip(variables, event.data_out.mip_solution):
+                    variable.varValue = round(x) if variable.cat == constants.LpInteger else x
+                self.on_incumbent({
+                    "objective": event.data_out.objective_function_value,
+                    "bound": event.data_out.mip_dual_bound,
+                    "gap": event.data_out.mip_gap,
+                })
+            highs.cbMipImprovingSolution.subscribe(improved)
+        # The last dual bound reported before the first branch is the bound of the root node
+        root = {}
+        if self.mip:
+            def at_root(event):
+                if event.data_out.mip_node_count == 0 and abs(event.data_out.mip_dual_bound) < highspy.kHighsInf:
+                    root["bound"] = event.data_out.mip_dual_bound
+            highs.cbMipInterrupt.subscribe(at_root)
+        if self.interrupt is not None:
+            def check(event):
+                if self.interrupt():
+                    event.interrupt()
+            highs.cbMipInterrupt.subscribe(check)
+
+        solve_start = time.perf_counter()
+        highs.run()
+        self.solution_time = time.perf_counter() - solve_start
+
+        model_status = highs.getModelStatus()
+        info = highs.getInfo()
+        has_solution = info.primal_solution_status == 2
+        status, solution_status = HIGHS_STATUS.get(model_status.name, (constants.LpStatusNotSolved, constants.LpSolutionNoSolutionFound))
+        if solution_status == constants.LpSolutionIntegerFeasible and not has_solution:
+            status, solution_status = constants.LpStatusNotSolved, constants.LpSolutionNoSolutionFound
+        self.stats = {"nodes": info.mip_node_count, "bound": info.mip_dual_bound, "gap": info.mip_gap, "root_bound": root.get("bound")}
+        if self.mip and self.stats["root_bound"] is None and info.mip_node_count == 0 and abs(info.mip_dual_bound) < highspy.kHighsInf:
+            # Solved without a callback, e.g. by presolve, the root bound is the final one
+            self.stats["root_bound"] = info.mip_dual_bound
+
+        if has_solution:
+            values = highs.getSolution().col_value
+            for variable, x in zip(variables, values):
+                # Integer columns come back within the integrality tolerance, e.g. 2452.9999999999995
+                variable.varValue = round(x) if variable.cat == constants.LpInteger and self.mip else x
+        lp.assignStatus(status, solution_status)
+        return status
+
+
+def make_solver(name="cbc", msg=False, time_limit=None, gap=None, threads=None, seed=None):
+    # "cbc" runs the CBC binary on an MPS file, "highs" solves in this process. A different seed
+    # changes the search of the solver, not the optimum.
+    if name == "cbc":
+        return PULP_CBC_CMD(msg=msg, timeLimit=time_limit, gapRel=gap, threads=threads, options=[] if seed is None else ["randomCbcSeed %d" % seed])
+    if name == "highs":
+        return HighsSolver(msg=msg, timeLimit=time_limit, gapRel=gap, threads=threads, seed=seed)
+    raise ValueError("Unknown solver: %s" % name)
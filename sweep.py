@@ -0,0 +1,139 @@
+import multiprocessing as mp
+
+from bounds import makespan_lower_bound
+from dag import DagIndex
+from incremental import IncrementalModel
+from scheduler import default_instance, get_schedule, plot_job, solve_instance
+from result_store import ResultStore
+from cache import SolveCache
+from schedule import Schedule
+
+# Best known makespan of every (n_a, n_b) configuration, shared between the workers.
+# 0 means the configuration has not been solved yet.
+best_makespans = None
+# The schedule of those makespans: per task the index of its processor among the processors of the
+# largest configuration and its start time, -1 if the schedule is not known
+best_schedules = None
+grid_width = 0
+store = None
+cache = None
+dag = None
+all_processors = None
+# The incremental model of this worker, built at its first configuration
+model = None
+model_size = None
+
+
+def init_worker(shared_makespans, shared_schedules, max_counts, store_path, cache_path, incremental=False):
+    global best_makespans, best_schedules, grid_width, store, cache, dag, all_processors, model_size
+    best_makespans = shared_makespans
+    best_schedules = shared_schedules
+    grid_width = max_counts["B"] + 1
+    dag = DagIndex(default_instance.predecessors)
+    all_processors = default_instance.processors(max_counts)[0]
+    model_size = max_counts if incremental else None
+    if store_path is not None:
+        store = ResultStore(store_path)
+    if cache_path is not None:
+        cache = SolveCache(cache_path)
+
+
+def upper_bound(n_a, n_b, max_duration):
+    # Adding processors never increases the makespan, so every solved configuration
+    # with at most n_a A and at most n_b B processors is a valid upper bound
+    bound = max_duration
+    for i in range(n_a + 1):
+        for j in range(n_b + 1):
+            found = best_makespans[i * grid_width + j]
+            if found > 0:
+                bound = min(bound, found)
+    return bound
+
+
+def share_schedule(n_a, n_b, result):
+    n_tasks = len(default_instance.tasks)
+    offset = (n_a * grid_width + n_b) * 2 * n_tasks
+    processor_index = {processor: a for a, processor in enumerate(all_processors)}
+    with best_makespans.get_lock():
+        best_makespans[n_a * grid_width + n_b] = int(result["makespan"])
+        best_schedules[offset:offset + n_tasks] = [processor_index[result["assignment"][task]] for task in default_instance.tasks]
+        best_schedules[offset + n_tasks:offset + 2 * n_tasks] = [int(result["start_times"][task]) for task in default_instance.tasks]
+
+
+def dominating_result(n_a, n_b, lower_bound):
+    # A schedule of a configuration with at most n_a A and n_b B processors that reaches the lower
+    # bound of (n_a, n_b) is also optimal for (n_a, n_b), None if no solved configuration has one
+    n_tasks = len(default_instance.tasks)
+    with best_makespans.get_lock():
+        sources = [i * grid_width + j for i in range(n_a + 1) for j in range(n_b + 1)
+                   if 0 < best_makespans[i * grid_width + j] <= lower_bound and best_schedules[(i * grid_width + j) * 2 * n_tasks] >= 0]
+        if not sources:
+            return None
+        offset = sources[0] * 2 * n_tasks
+        processor = best_schedules[offset:offset + n_tasks]
+        start = best_schedules[offset + n_tasks:offset + 2 * n_tasks]
+    counts = {"A": n_a, "B": n_b}
+    processors, time_costs_per_processor = default_instance.processors(counts)
+    result = {
+        "assignment": {task: all_processors[a] for task, a in zip(default_instance.tasks, processor)},
+        "start_times": dict(zip(default_instance.tasks, start)),
+    }
+    schedule = Schedule.from_result(result, default_instance.tasks, processors, time_costs_per_processor)
+    return dict(result, makespan=schedule.makespan, schedule=schedule, status="Optimal", build_time=0.0, wall_time=0.0,
+                formulation="bound", exact=True, proven=True, counts=counts, n_a=n_a, n_b=n_b, instance=default_instance.name)
+
+
+def solve_config(config):
+    global model
+    n_a, n_b, max_duration, experiment, options = config
+    bound = upper_bound(n_a, n_b, max_duration) + 2
+    lower_bound = makespan_lower_bound(default_instance, {"A": n_a, "B": n_b}, dag, lp=True)
+    result = dominating_result(n_a, n_b, lower_bound)
+    if result is not None:
+        # No solve needed, a configuration with fewer processors already reaches the lower bound
+        if store is not None:
+            store.add(dict(result, experiment=experiment))
+    elif model_size is not None:
+        # Only the solver options are used per solve, the others shape the model
+        solve_options = {key: options[key] for key in ("solver", "warm_start", "metrics", "time_limit", "gap") if key in options}
+        if model is None:
+            model_options = {key: value for key, value in options.items() if key not in solve_options and key != "formulation"}
+            model = IncrementalModel(default_instance, model_size, max_duration + 2, **model_options)
+        result = solve_instance(default_instance, {"A": n_a, "B": n_b}, bound, store, experiment, cache, model=model, lower_bound=lower_bound, **solve_options)
+    else:
+        result = get_schedule(n_a, n_b, bound, store=store, experiment=experiment, cache=cache, lower_bound=lower_bound, **options)
+    if result["makespan"] is not None:
+        share_schedule(n_a, n_b, result)
+    return result
+
+
+def run_sweep(max_a, max_b, max_duration, costs, processes=None, store_path=None, experiment=None, plot=True, cache_path=None, incremental=False, **options):
+    # With incremental, every worker builds one disjunctive model for max_a A and max_b B processors
+    # and re-solves it for each of its configurations
+    if incremental and options.get("formulation", "disjunctive") != "disjunctive":
+        raise ValueError("Only the disjunctive formulation can be solved incrementally")
+    configs = [(n_a, n_b) for n_a in range(max_a + 1) for n_b in range(max_b + 1) if n_a + n_b > 0]
+    # Solve the small configurations first, their makespans bound the larger ones
+    order = sorted(range(len(configs)), key=lambda i: configs[i][0] + configs[i][1])
+
+    shared_makespans = mp.Array("i", (max_a + 1) * (max_b + 1))
+    shared_schedules = mp.Array("i", [-1] * ((max_a + 1) * (max_b + 1) * 2 * len(default_instance.tasks)), lock=False)
+    if store_path is not None:
+        # Earlier results of the same experiment are valid upper bounds as well
+        for (n_a, n_b), makespan in ResultStore(store_path).best_makespans(experiment, default_instance.name).items():
+            if n_a <= max_a and n_b <= max_b:
+                shared_makespans[n_a * (max_b + 1) + n_b] = int(makespan)
+
+    with mp.Pool(processes, initializer=init_worker, initargs=(shared_makespans, shared_schedules, {"A": max_a, "B": max_b}, store_path, cache_path, incremental)) as pool:
+        solved = pool.map(solve_config, [configs[i] + (max_duration, experiment, options) for i in order], chunksize=1)
+
+    # Gantt charts are drawn after all solves, headless sweeps do not even import matplotlib
+    if plot:
+        from plotting import render_schedules
+        render_schedules([plot_job(result) for result in solved if result["makespan"] is not None], processes)
+
+    makespans = [0] * len(configs)
+    for i, result in zip(order, solved):
+        makespans[i] = result["makespan"]
+    system_costs = [n_a * costs["A"] + n_b * costs["B"] for n_a, n_b in configs]
+    return makespans, system_costs